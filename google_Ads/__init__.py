@@ -0,0 +1,7 @@
+"""
+Google Ads asset stats scraper and its offline tooling.
+
+Run `python -m google_Ads --help` for the commands. Importing the package or
+any of its modules never starts a browser; Selenium, pandas and the HTML
+parsers are only loaded by the code paths that use them.
+"""
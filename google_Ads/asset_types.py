@@ -0,0 +1,12 @@
+# Asset-type chips of the Assets -> Associations table, shared by the
+# scraper and the mock UI. Kept free of selenium so the mock server can
+# import it without a browser stack.
+
+# Chips in the order of asset-type-filter-chips (position = index + 1)
+ASSET_TYPES = [
+    "All", "Sitelink", "Callout", "Structured snippet", "Image", "Business name", "Business logo",
+    "Call", "Lead form", "Price", "App", "Promotion", "Location", "Video",
+]
+
+# Position of the Location chip, the table the scraper reads by default
+LOCATION_CHIP = ASSET_TYPES.index("Location") + 1
@@ -0,0 +1,157 @@
+import os
+import json
+import shutil
+import logging
+import functools
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service as ChromeService
+
+from .network import enable_capture
+
+
+CHROMEDRIVER_PATH = "/usr/local/bin/chromedriver"
+
+# An explicit chromedriver binary, and the version webdriver_manager downloads when none is found
+CHROMEDRIVER_ENV_VAR = "CHROMEDRIVER_PATH"
+CHROMEDRIVER_VERSION_ENV_VAR = "CHROMEDRIVER_VERSION"
+# Remembers the downloaded driver so later runs skip webdriver_manager's online version check
+DRIVER_CACHE_FILE = os.path.join(os.path.expanduser("~"), ".cache", "google_ads", "chromedriver.json")
+
+# Set to 1 (or pass --debug-browser) for a visible window that loads everything
+DEBUG_ENV_VAR = "GOOGLE_ADS_DEBUG_BROWSER"
+WINDOW_SIZE = "1920,1080"  # headless windows are small by default, which changes the Ads layout
+
+# Requests the scraper never needs: images, fonts, media and analytics beacons
+BLOCKED_URL_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.ico", "*.bmp",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*.mp4", "*.webm", "*.mp3", "*.ogg", "*.wav",
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+    "*/gen_204*", "*csi.gstatic.com*", "*play.google.com/log*",
+]
+
+# Chrome features that only cost CPU, memory or network in an automated session
+DISABLED_FEATURES = [
+    "Translate", "OptimizationHints", "MediaRouter", "InterestFeedContentSuggestions",
+    "CalculateNativeWinOcclusion", "AutofillServerCommunication", "BackForwardCache",
+]
+
+
+def debug_browser():
+    """True if the visible, unblocked debug browser was requested."""
+    return os.environ.get(DEBUG_ENV_VAR, "") not in ("", "0")
+
+
+def chrome_options(profile_dir=None, headless=True, debug=None, capture=False):
+    """
+    Chrome options shared by every scraper session: headless, no images,
+    no extensions or background services.
+
+    Parameters:
+    profile_dir : str : Optional Chrome user-data directory to keep the login in.
+                        Chrome locks a profile, so each parallel session needs its own.
+    headless : bool : Run without a window
+    debug : bool : Visible window with nothing disabled, defaults to debug_browser()
+    capture : bool : Record the network log for network extraction (mock benchmark only)
+    """
+    debug = debug_browser() if debug is None else debug
+    options = webdriver.ChromeOptions()
+    if capture:
+        enable_capture(options)
+    if profile_dir:
+        options.add_argument(f"--user-data-dir={profile_dir}")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--disable-notifications")
+    options.add_argument("--disable-popup-blocking")
+    if debug:
+        return options
+
+    if headless:
+        options.add_argument("--headless=new")
+    options.add_argument(f"--window-size={WINDOW_SIZE}")
+    options.add_argument("--disable-extensions")
+    options.add_argument("--disable-background-networking")
+    options.add_argument("--disable-component-update")
+    options.add_argument("--disable-default-apps")
+    options.add_argument("--disable-sync")
+    options.add_argument("--no-first-run")
+    options.add_argument("--mute-audio")
+    options.add_argument(f"--disable-features={','.join(DISABLED_FEATURES)}")
+    options.add_argument("--blink-settings=imagesEnabled=false")
+    options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+    return options
+
+
+def apply_network_profile(driver, blocked_urls=BLOCKED_URL_PATTERNS):
+    """Blocks `blocked_urls` for the whole session through CDP."""
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": list(blocked_urls)})
+
+
+def _load_cached_driver(version):
+    try:
+        with open(DRIVER_CACHE_FILE, encoding="utf-8") as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if cached.get("version") == version and os.path.exists(cached.get("path", "")):
+        return cached["path"]
+    return None
+
+
+def _save_cached_driver(path, version):
+    os.makedirs(os.path.dirname(DRIVER_CACHE_FILE), exist_ok=True)
+    tmp_path = f"{DRIVER_CACHE_FILE}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"path": path, "version": version}, f)
+    os.replace(tmp_path, DRIVER_CACHE_FILE)
+
+
+@functools.lru_cache(maxsize=None)
+def chromedriver_path(version=None):
+    """
+    Finds the chromedriver binary once per process, without network access
+    whenever possible: $CHROMEDRIVER_PATH, the driver cached by an earlier run,
+    CHROMEDRIVER_PATH, then `chromedriver` on the PATH. Only when none exists is
+    webdriver_manager imported to download one, and its path cached.
+
+    Parameters:
+    version : str : Driver version to pin the download and the cache to,
+                    defaults to $CHROMEDRIVER_VERSION (None for the latest)
+    """
+    explicit = os.environ.get(CHROMEDRIVER_ENV_VAR)
+    if explicit:
+        return explicit
+    version = version or os.environ.get(CHROMEDRIVER_VERSION_ENV_VAR) or None
+    cached = _load_cached_driver(version)
+    if cached:
+        return cached
+    if not version:
+        installed = CHROMEDRIVER_PATH if os.path.exists(CHROMEDRIVER_PATH) else shutil.which("chromedriver")
+        if installed:
+            return installed
+
+    from webdriver_manager.chrome import ChromeDriverManager
+    path = ChromeDriverManager(driver_version=version).install()
+    _save_cached_driver(path, version)
+    logging.info(f"Downloaded chromedriver {version or 'latest'} to {path}")
+    return path
+
+
+def create_driver(driver_path=None, profile_dir=None, headless=True, debug=None, capture=False):
+    """
+    Starts a new Chrome session with the production profile, or the visible
+    debug browser when `debug` (or GOOGLE_ADS_DEBUG_BROWSER) is set. With
+    `capture` the session records the network log that network extraction
+    reads the table rows from (used by the mock benchmark).
+    The chromedriver is resolved by chromedriver_path() unless `driver_path` is given.
+    """
+    debug = debug_browser() if debug is None else debug
+    service = ChromeService(driver_path or chromedriver_path())
+    driver = webdriver.Chrome(service=service, options=chrome_options(profile_dir, headless, debug, capture))
+    if not debug:
+        apply_network_profile(driver)
+    elif capture:
+        driver.execute_cdp_cmd("Network.enable", {})  # response bodies are read through the Network domain
+    return driver
@@ -0,0 +1,121 @@
+import os
+import json
+import time
+import shutil
+import hashlib
+import logging
+from datetime import datetime, timedelta
+
+from .timing import timed
+
+
+CACHE_DIR = "result_cache"
+CONVERSION_LAG_DAYS = 30   # periods ending earlier than this are closed and never expire
+RECENT_TTL_HOURS = 24      # lifetime of cached results for periods that can still change
+MAX_CACHE_MB = 1024        # size budget, least recently used entries are evicted first
+
+
+def cache_key(account_id, chip, filters, date_chunk):
+    """
+    Key of one scraped result: account, asset-type chip, the applied filter
+    set (order does not matter) and the exact date range.
+    """
+    identity = {
+        "account": account_id or "default",
+        "chip": chip,
+        "filters": sorted([list(f) for f in filters]),
+        "start_date": date_chunk[0],
+        "end_date": date_chunk[1],
+    }
+    return hashlib.sha256(json.dumps(identity, sort_keys=True).encode("utf-8")).hexdigest()[:32]
+
+
+def is_closed_period(date_chunk, lag_days=CONVERSION_LAG_DAYS, today=None):
+    """True if the period ended long enough ago that its stats no longer change."""
+    end = datetime.strptime(date_chunk[1], "%m/%d/%Y").date()
+    today = today or datetime.now().date()
+    return end < today - timedelta(days=lag_days)
+
+
+def _paths(cache_dir, key):
+    return os.path.join(cache_dir, f"{key}.csv"), os.path.join(cache_dir, f"{key}.json")
+
+
+def _write_json(path, data):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def cache_get(cache_dir, key, ttl_hours=RECENT_TTL_HOURS):
+    """
+    Returns the path of the cached result CSV for `key`, or None if it is
+    missing or an open period older than the TTL. Entries are files so hits
+    can be streamed instead of loaded whole.
+    """
+    data_path, meta_path = _paths(cache_dir, key)
+    if not (os.path.exists(data_path) and os.path.exists(meta_path)):
+        return None
+    try:
+        with open(meta_path, encoding="utf-8") as f:
+            meta = json.load(f)
+        if not meta["closed"] and time.time() - meta["created_at"] > ttl_hours * 3600:
+            logging.info(f"Cached result for {meta['start_date']} - {meta['end_date']} expired")
+            return None
+    except (OSError, ValueError, KeyError) as e:
+        logging.warning(f"⚠️ Unreadable cache entry {key}: {e}")
+        return None
+
+    meta["last_access"] = time.time()
+    _write_json(meta_path, meta)
+    return data_path
+
+
+@timed("cache_put")
+def cache_put(cache_dir, key, date_chunk, csv_path, rows, lag_days=CONVERSION_LAG_DAYS, max_mb=MAX_CACHE_MB):
+    """Stores a copy of a scraped chunk CSV and evicts old entries if the cache is over budget."""
+    os.makedirs(cache_dir, exist_ok=True)
+    data_path, meta_path = _paths(cache_dir, key)
+    tmp_path = f"{data_path}.{os.getpid()}.tmp"
+    shutil.copyfile(csv_path, tmp_path)
+    os.replace(tmp_path, data_path)
+
+    now = time.time()
+    _write_json(meta_path, {
+        "start_date": date_chunk[0],
+        "end_date": date_chunk[1],
+        "closed": is_closed_period(date_chunk, lag_days),
+        "rows": rows,
+        "size": os.path.getsize(data_path),
+        "created_at": now,
+        "last_access": now,
+    })
+    evict(cache_dir, max_mb)
+
+
+def evict(cache_dir, max_mb=MAX_CACHE_MB):
+    """Removes least recently used entries until the cache fits in `max_mb`."""
+    entries = []
+    for name in os.listdir(cache_dir):
+        if not name.endswith(".json"):
+            continue
+        key = name[:-5]
+        data_path, meta_path = _paths(cache_dir, key)
+        try:
+            with open(meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            continue
+        entries.append((meta.get("last_access", 0), meta.get("size", 0), data_path, meta_path))
+
+    total = sum(size for _, size, _, _ in entries)
+    budget = max_mb * 1024 * 1024
+    for _, size, data_path, meta_path in sorted(entries):
+        if total <= budget:
+            break
+        for path in (meta_path, data_path):
+            if os.path.exists(path):
+                os.remove(path)
+        total -= size
+        logging.info(f"Evicted cache entry {os.path.basename(data_path)}")
@@ -0,0 +1,38 @@
+import sys
+import logging
+import argparse
+import importlib
+
+
+PROG = "python -m google_Ads"
+LOG_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+
+# Command -> (module, help). A command's module is only imported when it runs,
+# so commands without a browser never load Selenium, and --help loads nothing.
+COMMANDS = {
+    "scrape": ("scraper", "Scrape the asset table of a date range chunk by chunk (starts Chrome)"),
+    "plan": ("planner", "Show the date chunks of a run and their manifest status"),
+    "replay": ("replay", "Replay, check or benchmark captured table snapshots offline"),
+    "parity": ("parsing", "Check every parser backend against the reference loop on saved HTML"),
+    "mock": ("mock_ads", "Serve the local mock Ads UI or benchmark the scraper against it"),
+}
+
+
+def main(argv=None):
+    """
+    Entry point of `python -m google_Ads <command> [options]`. Everything
+    after the command name is parsed by the command's own main().
+
+    Returns:
+    The command's exit code
+    """
+    parser = argparse.ArgumentParser(prog=PROG, description="Google Ads asset stats tooling.")
+    commands = parser.add_subparsers(dest="command", required=True, metavar="command")
+    for name, (_, help_text) in COMMANDS.items():
+        commands.add_parser(name, help=help_text, add_help=False)
+    argv = sys.argv[1:] if argv is None else list(argv)
+    args = parser.parse_args(argv[:1])
+
+    logging.basicConfig(level=logging.INFO, format=LOG_FORMAT)
+    module = importlib.import_module(f".{COMMANDS[args.command][0]}", __package__)
+    return module.main(argv[1:], prog=f"{PROG} {args.command}") or 0
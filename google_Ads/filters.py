@@ -0,0 +1,156 @@
+import logging
+from selenium.webdriver.common.by import By
+from selenium.webdriver.common.keys import Keys
+from selenium.webdriver.common.action_chains import ActionChains
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
+
+from .waits import (
+    wait_for, try_wait_for, clickable, element_removed, table_signature, wait_for_table_refresh,
+)
+from .timing import span, timed
+
+
+ADD_FILTER_XPATH = '/html/body/div[1]/root/div/div[1]/div[2]/div/div[3]/div/workspace-filters-portal/div/workspace-filter/filter-bar/div/div[3]/menu-suggest-input/div/input'
+FIELD_XPATH = '//material-select-item[@aria-label="{field}"]'
+OPERATOR_XPATH = '//div[contains(@aria-label, "Select operator")]'
+OPERATOR_OPTION_XPATH = "//material-select-dropdown-item[.//span[contains(text(), '{operator}')]]"
+VALUE_XPATH = '//textarea[@aria-label="Value"]'
+APPLY_XPATH = '//material-button[@aria-label="Apply"]'
+FILTER_CHIP_XPATH = "//filter-bar//filter-chip"
+
+APPLY_ATTEMPTS = 2  # passes over the filters that are not shown as chips yet
+
+# How a chip shows a filter: its aria-label ("Campaign name contains omni") or
+# its text ("Campaign name contains: omni"), the value possibly in quotes
+CHIP_FORMS = ['{field} {operator} {value}', '{field} {operator}: {value}',
+              '{field} {operator} "{value}"', '{field} {operator}: "{value}"']
+
+
+def filter_chips(driver):
+    """Texts of the active filter chips (their aria-label, or the visible text)."""
+    return [(chip.get_attribute("aria-label") or chip.text).strip()
+            for chip in driver.find_elements(By.XPATH, FILTER_CHIP_XPATH)]
+
+
+def _normalize(text):
+    return " ".join(text.lower().split())
+
+
+def _chip_matches(chip, field_filter):
+    """
+    A chip shows a filter if it reads exactly as its field, operator and
+    value in one of CHIP_FORMS (case and spacing aside), so that e.g. a
+    "does not contain" chip never stands in for "contains".
+    """
+    field, operator, value = (_normalize(part) for part in field_filter)
+    return _normalize(chip) in {form.format(field=field, operator=operator, value=value) for form in CHIP_FORMS}
+
+
+def missing_filters(driver, filters):
+    """The filters of `filters` that no chip of the filter bar shows."""
+    chips = filter_chips(driver)
+    return [f for f in filters if not any(_chip_matches(chip, f) for chip in chips)]
+
+
+def filters_shown(filters):
+    """Condition: every filter of `filters` is shown as a chip."""
+    def _condition(driver):
+        return not missing_filters(driver, filters)
+    return _condition
+
+
+def _operator_selected(operator):
+    def _condition(driver):
+        label = driver.find_element(By.XPATH, OPERATOR_XPATH).get_attribute("aria-label") or ""
+        return label.rsplit(":", 1)[-1].strip() == operator
+    return _condition
+
+
+@timed("filter")
+def add_filter(driver, filter_name, operator, value):
+    """
+    Adds a filter in the UI and waits for its editor to close. The table
+    reload is not awaited, so that several filters can be added in a row.
+
+    Parameters:
+    driver : WebDriver instance
+    filter_name : str : Name of the filter to select (e.g., "Campaign name")
+    operator : str : Operator to select (e.g., "does not contain", "contains")
+    value : str : Value to enter in the text area
+    """
+    actions = ActionChains(driver)
+
+    # Click "Add Filter" input box and pick the field once the suggestion menu has opened
+    clickable(driver, ADD_FILTER_XPATH, step="filter").click()
+    field = wait_for(driver, EC.visibility_of_element_located((By.XPATH, FIELD_XPATH.format(field=filter_name))),
+                     step="filter")
+    actions.move_to_element(field).click().perform()
+
+    # The operator dropdown is only opened if it does not show the operator already
+    dropdown = clickable(driver, OPERATOR_XPATH, step="filter")
+    if not _operator_selected(operator)(driver):
+        dropdown.click()
+        clickable(driver, OPERATOR_OPTION_XPATH.format(operator=operator), step="filter").click()
+        # The dropdown's label format is not guaranteed: the filter chips are checked in apply_filters
+        if not try_wait_for(driver, _operator_selected(operator), step="filter"):
+            logging.debug(f'Operator "{operator}" not confirmed by the dropdown label, continuing.')
+
+    # Enter the value and apply
+    textarea = clickable(driver, VALUE_XPATH, step="filter")
+    textarea.send_keys(value)
+    wait_for(driver, lambda d: d.find_element(By.XPATH, VALUE_XPATH).get_attribute("value") == value, step="filter")
+    apply_button = clickable(driver, APPLY_XPATH, step="filter")
+    actions.move_to_element(apply_button).click().perform()
+    try_wait_for(driver, element_removed(VALUE_XPATH), step="filter")
+    logging.info(f'Filter applied: {filter_name} {operator} "{value}"')
+
+
+def apply_filters(driver, filters, attempts=APPLY_ATTEMPTS):
+    """
+    Applies a set of (field, operator, value) filters in one pass over the
+    filter bar and checks the result against the filter chips. Filters that
+    already have a chip are skipped, so re-applying the saved set after a
+    reload or in a new session only adds what is missing, and costs a single
+    chip lookup when nothing is.
+
+    Parameters:
+    driver : WebDriver instance on the assets table
+    filters : list : (field, operator, value) tuples
+    attempts : int : Passes over the missing filters before giving up
+
+    Returns:
+    Number of filters added
+
+    Raises TimeoutException if some filters are still not shown after all
+    attempts, which recovery.with_recovery retries like any other slow step.
+    """
+    filters = [tuple(f) for f in filters]
+    missing = missing_filters(driver, filters)
+    if not missing:
+        logging.info(f"✅ All {len(filters)} filters already active")
+        return 0
+
+    added = 0
+    with span("filters", filters=len(missing)):
+        previous_signature = table_signature(driver)
+        for _ in range(attempts):
+            for filter_name, operator, value in missing:
+                try:
+                    add_filter(driver, filter_name, operator, value)
+                    added += 1
+                except Exception as e:
+                    logging.warning(f"⚠️ Could not add filter {filter_name} {operator} \"{value}\": {e}")
+                    ActionChains(driver).send_keys(Keys.ESCAPE).perform()  # close a half-filled editor
+            try_wait_for(driver, filters_shown(filters), step="filter")
+            missing = missing_filters(driver, filters)
+            if not missing:
+                break
+
+        # The table reloads once for the whole set
+        wait_for_table_refresh(driver, previous_signature)
+
+    if missing:
+        raise TimeoutException(f"Filters not applied: {missing}")
+    logging.info(f"✅ {len(filters)} filters active ({added} added)")
+    return added
@@ -0,0 +1,70 @@
+import logging
+
+from .parsing import parse_rows
+from .js_rows import extract_rows_js
+from .scrolling import scroll_until_converged, scroll_fixed
+
+
+# Returns the outerHTML of every rendered row not returned before. The seen-set
+# lives on the table element, so recycled row nodes with new content come back.
+_NEW_ROWS_JS = """
+var table = arguments[0];
+if (arguments[1] || !table.__harvestSeen) { table.__harvestSeen = {}; }
+var seen = table.__harvestSeen;
+var rows = table.querySelectorAll("div[role='row']");
+var fresh = [];
+for (var i = 0; i < rows.length; i++) {
+    var html = rows[i].outerHTML;
+    if (!seen[html]) { seen[html] = true; fresh.push(html); }
+}
+return fresh;
+"""
+
+
+def row_key(row_data):
+    """Stable identity of a row: the asset text plus all of its cell values."""
+    return tuple(row_data)
+
+
+def harvest_table(driver, table_div, scroll_mode="adaptive", max_scroll_attempts=15, wait_time=1, backend="js"):
+    """
+    Scrolls through a virtualized table and collects the rows that became
+    visible after each scroll step, instead of parsing one snapshot at the end.
+    Rows are deduplicated on `row_key` and kept in first-seen order.
+
+    Parameters:
+    driver : WebDriver instance
+    table_div : WebElement : The scrollable table element
+    scroll_mode : str : "adaptive" or "fixed" (see scrolling.py)
+    max_scroll_attempts : int : PAGE_DOWN presses in "fixed" mode
+    wait_time : float : Pause between presses in "fixed" mode
+    backend : str : "js" (rows extracted in the page) or "html" (row HTML parsed here)
+
+    Returns:
+    (rows, scroll_steps) : list of row cell lists, number of scroll steps
+    """
+    harvested = {}
+    stats = {"fragments": 0}
+
+    def collect(step=None):
+        if backend == "js":
+            fresh = extract_rows_js(driver, table_div, only_new=True, reset=step is None)
+            stats["fragments"] += len(fresh)
+            for row_data in fresh:
+                harvested.setdefault(row_key(row_data), row_data)
+            return
+        fresh = driver.execute_script(_NEW_ROWS_JS, table_div, step is None)
+        stats["fragments"] += len(fresh)
+        for html in fresh:
+            for row_data in parse_rows(html):
+                harvested.setdefault(row_key(row_data), row_data)
+
+    collect()
+    if scroll_mode == "fixed":
+        steps = scroll_fixed(table_div, max_scroll_attempts, wait_time, on_step=collect)
+    else:
+        steps = scroll_until_converged(driver, table_div, on_step=collect)
+    collect(steps)  # rows rendered while the last step settled
+
+    logging.info(f"Harvested {len(harvested)} unique rows from {stats['fragments']} row fragments")
+    return list(harvested.values()), steps
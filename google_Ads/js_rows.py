@@ -0,0 +1,91 @@
+import logging
+
+from .parsing import parse_rows
+
+
+# Extracts every div[role=row] of the table as an array of cell texts in one
+# round trip. Mirrors parsing.parse_row: a cell is the non-empty texts of all of
+# its divs joined by a space, where a div's text is its trimmed text nodes
+# concatenated (BeautifulSoup's get_text(strip=True)). Each node is visited once.
+#
+# arguments: table element, onlyNew (skip rows returned by an earlier onlyNew
+# call on this element), reset (forget those rows first)
+ROWS_JS = """
+var table = arguments[0], onlyNew = arguments[1], reset = arguments[2];
+if (reset || !table.__jsRowsSeen) { table.__jsRowsSeen = {}; }
+var seen = table.__jsRowsSeen;
+
+function collect(node, out) {
+    var slot = -1;
+    if (node.nodeType === 1 && node.tagName === "DIV") { slot = out.length; out.push(""); }
+    var text = "";
+    for (var child = node.firstChild; child; child = child.nextSibling) {
+        if (child.nodeType === 3) {
+            var t = child.nodeValue.trim();
+            if (t) { text += t; }
+        } else if (child.nodeType === 1) {
+            text += collect(child, out);
+        }
+    }
+    if (slot >= 0) { out[slot] = text; }
+    return text;
+}
+
+var result = [];
+var rows = table.querySelectorAll("div[role='row']");
+for (var i = 0; i < rows.length; i++) {
+    var cells = rows[i].querySelectorAll("ess-cell");
+    if (!cells.length) { continue; }
+    var rowData = [];
+    for (var j = 0; j < cells.length; j++) {
+        var divTexts = [];
+        collect(cells[j], divTexts);
+        rowData.push(divTexts.filter(function (t) { return t; }).join(" "));
+    }
+    if (onlyNew) {
+        var key = rowData.join("\\u0001");
+        if (seen[key]) { continue; }
+        seen[key] = true;
+    }
+    result.push(rowData);
+}
+return result;
+"""
+
+
+def extract_rows_js(driver, table_div, only_new=False, reset=False):
+    """
+    Runs the row extraction inside the page and returns a list of rows
+    (lists of cell texts), in the same shape as parsing.parse_rows.
+
+    Parameters:
+    driver : WebDriver instance
+    table_div : WebElement : The table element
+    only_new : bool : Only return rows not returned by an earlier only_new call
+    reset : bool : Forget the rows returned earlier before extracting
+    """
+    rows = driver.execute_script(ROWS_JS, table_div, only_new, reset)
+    if rows is None:
+        raise RuntimeError("Row extraction script returned nothing")
+    return rows
+
+
+def compare_backends(driver, table_div):
+    """
+    Extracts the current table with both backends and logs the differences.
+
+    Returns:
+    (identical, js_rows, html_rows)
+    """
+    js_rows = extract_rows_js(driver, table_div)
+    html_rows = parse_rows(table_div.get_attribute("outerHTML"))
+    identical = js_rows == html_rows
+    if identical:
+        logging.info(f"✅ Backends agree on {len(js_rows)} rows")
+    else:
+        logging.warning(f"⚠️ Backends differ: js={len(js_rows)} rows, html={len(html_rows)} rows")
+        for i, (js_row, html_row) in enumerate(zip(js_rows, html_rows)):
+            if js_row != html_row:
+                logging.warning(f"First difference at row {i}: js={js_row} html={html_row}")
+                break
+    return identical, js_rows, html_rows
@@ -0,0 +1,103 @@
+import os
+import json
+import time
+import logging
+
+
+MANIFEST_DIR = "run_manifest"
+
+PLANNED = "planned"
+IN_PROGRESS = "in_progress"
+DONE = "done"
+INCOMPLETE = "incomplete"  # paged to the end but short of the label's row total: scraped again on resume
+
+
+def chunk_key(date_chunk):
+    """'01/06/2025', '01/12/2025' -> '01-06-2025_01-12-2025'"""
+    return f"{date_chunk[0].replace('/', '-')}_{date_chunk[1].replace('/', '-')}"
+
+
+def _record_path(manifest_dir, date_chunk):
+    # One file per chunk: a chunk is only ever handled by one worker, so
+    # threads and processes never write the same file.
+    return os.path.join(manifest_dir, f"{chunk_key(date_chunk)}.json")
+
+
+def load_chunk(manifest_dir, date_chunk):
+    """Returns the manifest record of a chunk, or None if it was never planned."""
+    path = _record_path(manifest_dir, date_chunk)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_chunk(manifest_dir, record):
+    """Writes a chunk record atomically (temp file + rename)."""
+    os.makedirs(manifest_dir, exist_ok=True)
+    record["updated_at"] = time.time()
+    path = _record_path(manifest_dir, (record["start_date"], record["end_date"]))
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(record, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def new_record(date_chunk, output):
+    return {
+        "start_date": date_chunk[0],
+        "end_date": date_chunk[1],
+        "status": PLANNED,
+        "output": output,
+        "rows": 0,
+        "pages": {},
+    }
+
+
+def plan_chunks(manifest_dir, date_chunks, output_for, resume=False):
+    """
+    Records every chunk of the run as planned.
+
+    Parameters:
+    manifest_dir : str : Directory holding one JSON record per chunk
+    date_chunks : list : Date range tuples of the run
+    output_for : callable : output_for(date_chunk) -> output path
+    resume : bool : Keep existing records instead of starting over
+
+    Returns:
+    Dict of chunk key -> record
+    """
+    records = {}
+    for date_chunk in date_chunks:
+        record = load_chunk(manifest_dir, date_chunk) if resume else None
+        if record is None:
+            record = new_record(date_chunk, output_for(date_chunk))
+            if resume and os.path.exists(record["output"]):
+                # Written by a run without a manifest: the old flow only wrote complete chunks
+                record["status"] = DONE
+                logging.info(f"Found existing output {record['output']}, marking chunk as done")
+            save_chunk(manifest_dir, record)
+        records[chunk_key(date_chunk)] = record
+
+    done = sum(1 for r in records.values() if r["status"] == DONE)
+    logging.info(f"Manifest: {len(records)} chunks planned, {done} already done")
+    return records
+
+
+def last_finished_page(record):
+    """Highest page number recorded as done (0 if none)."""
+    return max((int(page) for page, info in record["pages"].items() if info["status"] == DONE), default=0)
+
+
+def mark_chunk(manifest_dir, record, status):
+    record["status"] = status
+    if status == IN_PROGRESS:
+        record.setdefault("started_at", time.time())
+    save_chunk(manifest_dir, record)
+
+
+def mark_page(manifest_dir, record, page_num, rows):
+    """Records a page as done once its rows are on disk."""
+    record["pages"][str(page_num)] = {"status": DONE, "rows": rows}
+    record["rows"] = sum(info["rows"] for info in record["pages"].values())
+    save_chunk(manifest_dir, record)
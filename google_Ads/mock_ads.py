@@ -0,0 +1,346 @@
+import os
+import json
+import time
+import random
+import hashlib
+import logging
+import argparse
+import tempfile
+import functools
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs
+
+from .asset_types import ASSET_TYPES, LOCATION_CHIP
+
+
+UI_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "mock_ui", "index.html")
+HOST = "127.0.0.1"
+PORT = 8765
+
+DEFAULT_COLUMNS = ["Asset", "Clicks", "Impr.", "CTR", "Avg. CPC", "Cost"]
+# Asset types whose table has more columns than the default
+EXTRA_COLUMNS = {
+    "Sitelink": ["Conv."],
+    "Lead form": ["Conv."],
+}
+
+FILTER_FIELDS = ["Campaign name", "Ad group name", "Asset status"]
+FILTER_OPERATORS = ["contains", "does not contain", "equals", "starts with"]
+CAMPAIGNS = ["Omni Brand", "Omni Local", "Omni Stores", "Mohey Test", "Generic Search"]
+
+# Mock behaviour, every key can be changed from the command line
+DEFAULT_CONFIG = {
+    "rows": 321,               # rows per date range before filters
+    "page_size": 50,           # initial rows per page
+    "page_sizes": [10, 30, 50, 100, 200, 500],
+    "latency_ms": 300,         # server delay of every /api/rows request
+    "render_ms": 50,           # client delay before rendering rows scrolled into view
+    "render_batch": 20,        # rows rendered per scroll step
+    "virtualize": False,       # drop rows scrolled out of view, like a virtualized grid
+    "virtual_buffer": 5,       # rows kept above the viewport when virtualizing
+    "row_height": 40,
+    "accounts": 3,
+    "default_chip": LOCATION_CHIP,
+    "default_start": "1/6/2025",
+    "default_end": "1/26/2025",
+}
+
+
+def account_ids(count):
+    """Customer ids of the mock client accounts, e.g. '101-000-0001'."""
+    return [f"101-000-{i:04d}" for i in range(1, count + 1)]
+
+
+def _matches(row, field, operator, value):
+    text = {"Campaign name": row["campaign"], "Ad group name": row["ad_group"],
+            "Asset status": row["status"]}.get(field, "").lower()
+    value = value.lower()
+    if operator == "contains":
+        return value in text
+    if operator == "does not contain":
+        return value not in text
+    if operator == "equals":
+        return text == value
+    if operator == "starts with":
+        return text.startswith(value)
+    return True
+
+
+def generate_rows(config, account, chip, start, end, filters):
+    """
+    Deterministic table rows for one account, asset type and date range: the
+    same request always returns the same data, a different range different data.
+    Metrics are raw numbers (cost in micros), formatted by the page like in the
+    real UI.
+    """
+    seed = hashlib.sha256(json.dumps([account, chip, start, end]).encode("utf-8")).hexdigest()
+    rng = random.Random(seed)
+    asset_type = ASSET_TYPES[chip - 1] if 1 <= chip <= len(ASSET_TYPES) else "Asset"
+    rows = []
+    for i in range(config["rows"]):
+        impressions = rng.randint(0, 60000)
+        clicks = rng.randint(0, max(1, impressions // 15)) if impressions else 0
+        rows.append({
+            "asset": {"title": f"{asset_type} {i + 1:05d}", "subtitle": f"{rng.randint(1, 9999)} Main St, Springfield"},
+            "campaign": CAMPAIGNS[rng.randrange(len(CAMPAIGNS))],
+            "ad_group": f"Ad group {rng.randint(1, 20)}",
+            "status": rng.choice(["Eligible", "Paused", "Not eligible"]),
+            "clicks": clicks,
+            "impressions": impressions,
+            "cost_micros": clicks * rng.randint(100000, 3000000),
+            "conversions": round(clicks * rng.random() * 0.1, 2),
+        })
+    for field, operator, value in filters:
+        rows = [row for row in rows if _matches(row, field, operator, value)]
+    return asset_type, rows
+
+
+def rows_response(config, query):
+    """Body of /api/rows: one page of rows plus the totals of the whole range."""
+    chip = int(query.get("chip", config["default_chip"]))
+    filters = json.loads(query.get("filters") or "[]")
+    asset_type, rows = generate_rows(config, query.get("ocid", ""), chip, query.get("start"), query.get("end"),
+                                     filters)
+    page = max(1, int(query.get("page", 1)))
+    size = int(query.get("size", config["page_size"]))
+    summary = {key: sum(row[key] for row in rows) for key in ("clicks", "impressions", "cost_micros", "conversions")}
+    return {
+        "total": len(rows),
+        "page": page,
+        "size": size,
+        "columns": DEFAULT_COLUMNS + EXTRA_COLUMNS.get(asset_type, []),
+        "rows": rows[(page - 1) * size:page * size],
+        "summary": summary,
+    }
+
+
+def make_handler(config):
+    """Request handler class serving the mock UI and its data endpoint with `config`."""
+    with open(UI_FILE, encoding="utf-8") as f:
+        page = f.read()
+    client_config = dict(config, asset_types=ASSET_TYPES, filter_fields=FILTER_FIELDS,
+                         filter_operators=FILTER_OPERATORS, manager_id="100-000-0000",
+                         accounts=[{"id": account_id, "name": f"Mock account {i + 1}"}
+                                   for i, account_id in enumerate(account_ids(config["accounts"]))])
+    page = page.replace("/*MOCK_CONFIG*/{}", json.dumps(client_config)).encode("utf-8")
+
+    class MockAdsHandler(BaseHTTPRequestHandler):
+        def _send(self, status, body, content_type):
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("Cache-Control", "no-store")
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            parts = urlsplit(self.path)
+            if parts.path == "/api/rows":
+                query = {key: values[0] for key, values in parse_qs(parts.query).items()}
+                time.sleep(config["latency_ms"] / 1000)
+                try:
+                    body = json.dumps(rows_response(config, query)).encode("utf-8")
+                except (ValueError, TypeError) as e:
+                    self._send(400, str(e).encode("utf-8"), "text/plain")
+                    return
+                self._send(200, body, "application/json")
+            elif parts.path == "/robots.txt":
+                self._send(200, b"User-agent: *\nDisallow: /\n", "text/plain")
+            elif parts.path == "/" or parts.path.startswith("/aw/"):
+                self._send(200, page, "text/html; charset=utf-8")
+            else:
+                self._send(404, b"Not found", "text/plain")
+
+        def log_message(self, format, *args):
+            logging.debug(f"[mock] {self.address_string()} {format % args}")
+
+    return MockAdsHandler
+
+
+def start_server(config=None, host=HOST, port=PORT):
+    """
+    Starts the mock Ads UI in a background thread.
+
+    Returns:
+    (server, base_url); call server.shutdown() to stop it
+    """
+    config = dict(DEFAULT_CONFIG, **(config or {}))
+    server = ThreadingHTTPServer((host, port), make_handler(config))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="mock-ads", daemon=True).start()
+    base_url = f"http://{host}:{server.server_address[1]}"
+    logging.info(f"🧪 Mock Ads UI running at {base_url}/aw/campaigns")
+    return server, base_url
+
+
+# ---------------------------------------------------------------------------
+# End-to-end benchmark
+# ---------------------------------------------------------------------------
+
+# The benchmark imports the scraper (and Selenium) lazily so that serving the
+# mock alone needs nothing but the standard library.
+
+def mock_setup_session(driver, base_url, account_id=None, apply_filters=True):
+    """
+    setup_session for the mock: deep-links to the assets table (clicking through
+    the account list if that fails), applies the default campaign filters and
+    switches to the largest page size.
+    """
+    from .scraper import FILTER_PRESETS, DEFAULT_PRESET
+    from .filters import apply_filters
+    from .navigation import build_assets_url, navigate_by_link, navigate_by_clicks
+    from .pagination import maximize_page_size
+
+    url = build_assets_url(f"{base_url}/aw/assets/associations", account_id)
+    if not navigate_by_link(driver, url):
+        driver.get(f"{base_url}/aw/campaigns")
+        navigate_by_clicks(driver)
+    if apply_filters:
+        apply_filters(driver, FILTER_PRESETS[DEFAULT_PRESET])
+    maximize_page_size(driver)
+
+
+def timed_scrape(driver, date_chunk, manifest_dir, backend="js", harvest=False):
+    """Runs scraper.scrape_chunk and returns its wall time and row count."""
+    from .scraper import scrape_chunk
+    from .manifest import load_chunk
+
+    started = time.perf_counter()
+    output = scrape_chunk(driver, date_chunk, manifest_dir=manifest_dir,
+                          output_settings={"formats": ["csv"], "backend": backend, "harvest": harvest})
+    seconds = time.perf_counter() - started
+    record = load_chunk(manifest_dir, date_chunk)
+    return {"output": output, "seconds": round(seconds, 3), "rows": record["rows"] if record else 0,
+            "pages": len(record["pages"]) if record else 0}
+
+
+def run_benchmark(base_url, start, end, workers=1, mode="thread", headless=True, account_id=None,
+                  apply_filters=True, work_dir=None, backend="js", harvest=False):
+    """
+    Scrapes the mock end to end with the real scraper flow (date range,
+    scrolling, pagination, writing) and measures the wall time per chunk.
+
+    Parameters:
+    base_url : str : Where the mock Ads UI runs
+    start, end : str : Date range in 'MM/DD/YYYY' format, split into weekly chunks
+    workers : int : Parallel browser sessions
+    mode : str : "thread" or "process" pool mode
+    headless : bool : Run Chrome headless
+    account_id : str : Account to open, defaults to the first mock account
+    apply_filters : bool : Apply the default filter preset once per session
+    work_dir : str : Where chunk CSVs and the manifest go, defaults to a new temporary directory
+    backend : str : Row extraction backend of the scraper ("js", "html" or "network")
+    harvest : bool : Collect rows while scrolling (needed with --virtualize)
+
+    Returns:
+    Dict with the per-chunk results and the totals
+    """
+    from .browser import create_driver
+    from .planner import break_into_weekly_chunks
+    from .pool import run_pool
+
+    work_dir = work_dir or tempfile.mkdtemp(prefix="mock_ads_bench_")
+    os.chdir(work_dir)  # the scraper writes the chunk CSVs to the working directory
+    manifest_dir = os.path.join(work_dir, "run_manifest")
+    account_id = account_id or account_ids(1)[0]
+
+    date_chunks = break_into_weekly_chunks(start, end)
+    setup = functools.partial(mock_setup_session, base_url=base_url, account_id=account_id,
+                              apply_filters=apply_filters)
+    scrape = functools.partial(timed_scrape, manifest_dir=manifest_dir, backend=backend, harvest=harvest)
+    driver_factory = functools.partial(create_driver, headless=headless, capture=backend == "network")
+
+    started = time.perf_counter()
+    if workers > 1:
+        results = run_pool(date_chunks, setup, scrape, workers=workers, mode=mode,
+                           log_dir=os.path.join(work_dir, "logs"), driver_factory=driver_factory)
+    else:
+        driver = driver_factory()
+        try:
+            setup(driver)
+            results = []
+            for date_chunk in date_chunks:
+                try:
+                    results.append((date_chunk, scrape(driver, date_chunk), None))
+                except Exception as e:
+                    results.append((date_chunk, None, str(e)))
+        finally:
+            driver.quit()
+    wall = time.perf_counter() - started
+
+    chunks = []
+    for date_chunk, result, error in results:
+        chunks.append({"start_date": date_chunk[0], "end_date": date_chunk[1], "error": error,
+                       "seconds": result["seconds"] if result else None, "rows": result["rows"] if result else 0,
+                       "pages": result["pages"] if result else 0})
+    rows = sum(chunk["rows"] for chunk in chunks)
+    timed = [chunk["seconds"] for chunk in chunks if chunk["seconds"] is not None]
+    return {
+        "workers": workers,
+        "mode": mode,
+        "backend": backend,
+        "harvest": harvest,
+        "chunks": chunks,
+        "rows": rows,
+        "wall_seconds": round(wall, 3),
+        "mean_chunk_seconds": round(sum(timed) / len(timed), 3) if timed else None,
+        "rows_per_sec": round(rows / wall, 1) if wall else None,
+        "work_dir": work_dir,
+    }
+
+
+def main(argv=None, prog=None):
+    parser = argparse.ArgumentParser(prog=prog, description="Local stand-in for the Google Ads UI.")
+    parser.add_argument("command", choices=["serve", "bench"], help="Only serve the UI, or run the benchmark on it")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT, help="0 picks a free port")
+    for key, value in DEFAULT_CONFIG.items():
+        option = "--" + key.replace("_", "-")
+        if isinstance(value, bool):
+            parser.add_argument(option, action="store_true", default=value)
+        elif isinstance(value, list):
+            parser.add_argument(option, type=lambda s: [int(v) for v in s.split(",")], default=value)
+        else:
+            parser.add_argument(option, type=type(value), default=value)
+    parser.add_argument("--start", default="1/6/2025", help="bench: start date in MM/DD/YYYY format")
+    parser.add_argument("--end", default="1/26/2025", help="bench: end date in MM/DD/YYYY format")
+    parser.add_argument("--workers", type=int, default=1, help="bench: parallel browser sessions")
+    parser.add_argument("--pool-mode", choices=["thread", "process"], default="thread")
+    parser.add_argument("--headed", action="store_true", help="bench: show the browser")
+    parser.add_argument("--harvest", action="store_true",
+                        help="bench: collect rows while scrolling (always on with --virtualize)")
+    parser.add_argument("--backend", choices=["js", "html", "network"], default="js",
+                        help="bench: how the scraper reads the rows; network decodes the mock's /api/rows "
+                             "responses and is only available here, not in the scrape command")
+    parser.add_argument("--no-filters", action="store_true", help="bench: skip applying the filter preset")
+    parser.add_argument("--json", help="bench: also write the results to this JSON file")
+    args = parser.parse_args(argv)
+
+    config = {key: getattr(args, key) for key in DEFAULT_CONFIG}
+    json_path = os.path.abspath(args.json) if args.json else None  # the benchmark changes directory
+    server, base_url = start_server(config, args.host, args.port)
+    try:
+        if args.command == "serve":
+            print(f"Serving the mock Ads UI at {base_url}/aw/campaigns (Ctrl+C to stop)")
+            while True:
+                time.sleep(3600)
+
+        results = run_benchmark(base_url, args.start, args.end, workers=args.workers, mode=args.pool_mode,
+                                headless=not args.headed, apply_filters=not args.no_filters, backend=args.backend,
+                                harvest=args.harvest or args.virtualize)
+        for chunk in results["chunks"]:
+            status = (f"❌ {chunk['error']}" if chunk["error"]
+                      else f"{chunk['rows']} rows on {chunk['pages']} pages in {chunk['seconds']}s")
+            print(f"{chunk['start_date']} - {chunk['end_date']}: {status}")
+        print(f"⏱️ {results['rows']} rows in {results['wall_seconds']}s wall "
+              f"({results['rows_per_sec']} rows/s, {results['mean_chunk_seconds']}s per chunk)")
+        if json_path:
+            with open(json_path, "w", encoding="utf-8") as f:
+                json.dump(results, f, indent=2)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+    return 0
+
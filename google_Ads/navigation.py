@@ -0,0 +1,257 @@
+import os
+import re
+import json
+import logging
+import tempfile
+import threading
+from datetime import datetime
+from urllib.parse import urlencode, urlsplit, urlunsplit, parse_qsl
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+
+from .waits import TABLE_CANVAS_CLASS, wait_for, clickable, table_signature, wait_for_table_refresh
+from .session import ADS_HOME_URL
+from .asset_types import ASSET_TYPES, LOCATION_CHIP
+from .timing import span, timed
+
+
+ASSETS_URL = "https://ads.google.com/aw/assets/associations"
+ASSETS_URL_FILE = "assets_url.json"
+
+# Serializes the read-modify-write of ASSETS_URL_FILE between thread workers
+_assets_url_lock = threading.Lock()
+
+# Query parameters of the Ads UI deep link. "ocid" selects the account; the
+# others are only sent when a value is given.
+DEEP_LINK_PARAMS = {
+    "account": "ocid",
+    "asset_type": "assetType",
+    "start_date": "__sd",
+    "end_date": "__ed",
+}
+
+ACCOUNT_LIST_XPATH = "/html/body/div[1]/root/div[2]/nav-view-loader/multiaccount-view/div/div[2]/div/div[1]/material-list"
+ACCOUNT_ITEM_XPATH = f"{ACCOUNT_LIST_XPATH}/material-list-item[2]"
+CAMPAIGNS_ASSETS_XPATH = '//*[@id="navigation.campaigns.assets"]/div/a/navigation-drawer-item'
+ASSETS_ASSOCIATIONS_XPATH = '//*[@id="navigation.campaigns.assets.assets.associations"]/div/a/navigation-drawer-item/div[1]'
+ASSET_CHIPS_XPATH = '//*[@id="cmExtensionPoint-id"]/base-root/div/div[2]/div[1]/view-loader/asset-multi-view/div/asset-navigation-header/div/asset-type-filter-chips/material-chips/div'
+
+# Customer id as the account list shows it, e.g. 123-456-7890
+_CUSTOMER_ID_PATTERN = re.compile(r"\b\d{3}-\d{3}-\d{4}\b")
+
+
+def asset_chip_xpath(chip=LOCATION_CHIP):
+    """XPath of the n-th asset-type chip (13 is Location)."""
+    return f"{ASSET_CHIPS_XPATH}/material-chip[{chip}]"
+
+
+def resolve_asset_type(name_or_position):
+    """
+    'Sitelink' (any case) or '2' -> (2, 'sitelink'): the chip position and
+    the slug used in file names and partitions.
+    """
+    text = str(name_or_position).strip()
+    names = [name.lower() for name in ASSET_TYPES]
+    if text.isdigit() and 1 <= int(text) <= len(ASSET_TYPES):
+        chip = int(text)
+    elif text.lower() in names:
+        chip = names.index(text.lower()) + 1
+    else:
+        raise ValueError(f"Unknown asset type '{text}', expected a chip position or one of {', '.join(ASSET_TYPES)}")
+    return chip, names[chip - 1].replace(" ", "-")
+
+
+def _url_date(date):
+    """'MM/DD/YYYY' -> 'YYYYMMDD', the compact form the Ads UI uses in URLs."""
+    return datetime.strptime(date, "%m/%d/%Y").strftime("%Y%m%d")
+
+
+def load_assets_url(path=ASSETS_URL_FILE, account_id=None):
+    """Returns the remembered Assets → Associations URL for the account, if any."""
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        urls = json.load(f)
+    return urls.get(account_id or "default")
+
+
+def remember_assets_url(url, path=ASSETS_URL_FILE, account_id=None):
+    """
+    Stores the URL the click path landed on so later sessions can deep-link.
+    Thread workers update the file one at a time; process workers can still
+    overwrite each other's entry, which only costs a click-through later.
+    """
+    with _assets_url_lock:
+        urls = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                urls = json.load(f)
+        urls[account_id or "default"] = url
+        # A temp file of its own: thread workers share the pid
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(urls, f, indent=2)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+
+def build_assets_url(base_url=None, account_id=None, asset_type=None, start_date=None, end_date=None):
+    """
+    Builds the deep link to the Assets → Associations table.
+
+    Parameters:
+    base_url : str : URL to start from (e.g. a remembered one), defaults to ASSETS_URL
+    account_id : str : Account id for the "ocid" parameter
+    asset_type : str : Asset type to preselect
+    start_date : str : Start date in 'MM/DD/YYYY' format
+    end_date : str : End date in 'MM/DD/YYYY' format
+
+    Parameters already in `base_url` are kept unless overridden.
+    """
+    parts = urlsplit(base_url or ASSETS_URL)
+    query = dict(parse_qsl(parts.query))
+    values = {
+        "account": account_id,
+        "asset_type": asset_type,
+        "start_date": _url_date(start_date) if start_date else None,
+        "end_date": _url_date(end_date) if end_date else None,
+    }
+    for key, value in values.items():
+        if value:
+            query[DEEP_LINK_PARAMS[key]] = value
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def chip_selected(driver, chip=LOCATION_CHIP):
+    """True if the asset-type chip is the selected one."""
+    chips = driver.find_elements(By.XPATH, asset_chip_xpath(chip))
+    return bool(chips) and chips[0].get_attribute("aria-selected") == "true"
+
+
+@timed("navigation_link")
+def navigate_by_link(driver, url, chip=LOCATION_CHIP):
+    """
+    Opens the assets table with a single driver.get. Returns False if the page
+    did not end up on the table, so the caller can fall back to clicking.
+    """
+    driver.get(url)
+    try:
+        wait_for(driver, EC.presence_of_element_located((By.CLASS_NAME, TABLE_CANVAS_CLASS)), step="navigation")
+    except TimeoutException:
+        logging.warning(f"⚠️ Deep link did not open the assets table: {driver.current_url}")
+        return False
+    if "accounts.google.com" in driver.current_url:
+        return False
+    if chip and not chip_selected(driver, chip):
+        # The link landed on the table but not on the asset type: one click fixes that
+        clickable(driver, asset_chip_xpath(chip), step="navigation").click()
+        wait_for(driver, EC.presence_of_element_located((By.CLASS_NAME, TABLE_CANVAS_CLASS)), step="table_render")
+    logging.info("Opened the assets table via deep link.")
+    return True
+
+
+def account_item_xpath(account_id=None):
+    """XPath of an account in the account list, or of the first client account if None."""
+    if not account_id:
+        return ACCOUNT_ITEM_XPATH
+    return (f"{ACCOUNT_LIST_XPATH}/material-list-item"
+            f"[@data-customer-id='{account_id}' or contains(normalize-space(), '{account_id}')]")
+
+
+@timed("account_list")
+def list_accounts(driver, home_url=ADS_HOME_URL):
+    """
+    Reads the client accounts from the account list of the Ads home page.
+    The first item is the manager account (hence ACCOUNT_ITEM_XPATH's [2]);
+    items without a customer id are skipped.
+
+    Returns:
+    List of {"id": "123-456-7890", "name": ...} in list order
+    """
+    driver.get(home_url)
+    wait_for(driver, EC.presence_of_element_located((By.XPATH, f"{ACCOUNT_LIST_XPATH}/material-list-item")),
+             step="navigation")
+    accounts = []
+    for item in driver.find_elements(By.XPATH, f"{ACCOUNT_LIST_XPATH}/material-list-item")[1:]:
+        text = " ".join(item.text.split())
+        match = _CUSTOMER_ID_PATTERN.search(text)
+        account_id = item.get_attribute("data-customer-id") or (match.group(0) if match else None)
+        if account_id:
+            accounts.append({"id": account_id, "name": text.replace(account_id, "").strip()})
+    logging.info(f"Found {len(accounts)} accounts")
+    return accounts
+
+
+@timed("asset_type")
+def select_asset_type(driver, chip=LOCATION_CHIP):
+    """
+    Switches the assets table to another asset-type chip in place. The date
+    range and the filters stay as they are; only the table reloads. The
+    table refresh is what is awaited: the chip's aria-selected is only a
+    hint, as the live UI does not necessarily set it.
+    """
+    if chip_selected(driver, chip):
+        return
+    name = ASSET_TYPES[chip - 1] if chip <= len(ASSET_TYPES) else chip
+    previous_signature = table_signature(driver)
+    clickable(driver, asset_chip_xpath(chip), step="navigation").click()
+    if not wait_for_table_refresh(driver, previous_signature) and not chip_selected(driver, chip):
+        logging.warning(f"⚠️ Neither the chip nor the table confirmed the switch to asset type {name}")
+    logging.info(f"Switched to asset type {name}")
+
+
+def navigate_by_clicks(driver, chip=LOCATION_CHIP, account_id=None):
+    """The original click path from the Ads dashboard to the assets table."""
+    # Click the account (the first client account unless one is given)
+    with span("navigation_click", target="account"):
+        clickable(driver, account_item_xpath(account_id), step="navigation").click()
+    logging.info(f"Clicked on account {account_id or 'in the first list item'}.")
+
+    # Click Campaigns -> Assets
+    with span("navigation_click", target="assets"):
+        clickable(driver, CAMPAIGNS_ASSETS_XPATH, step="navigation").click()
+    logging.info("Clicked on Campaigns -> Assets.")
+
+    # Click Assets -> Associations
+    with span("navigation_click", target="associations"):
+        clickable(driver, ASSETS_ASSOCIATIONS_XPATH, step="navigation").click()
+    logging.info("Clicked on Assets -> Associations.")
+
+    # Click on the asset type filter (Location by default)
+    with span("navigation_click", target="asset_type"):
+        clickable(driver, asset_chip_xpath(chip), step="navigation").click()
+        wait_for(driver, EC.presence_of_element_located((By.CLASS_NAME, TABLE_CANVAS_CLASS)), step="table_render")
+    logging.info("Clicked on Location filter.")
+
+
+def navigate_to_assets(driver, account_id=None, chip=LOCATION_CHIP, start_date=None, end_date=None,
+                       deep_link=True, url_file=ASSETS_URL_FILE):
+    """
+    Lands on the Assets → Associations table, by deep link when possible and
+    through the click path otherwise. The URL reached by clicking is
+    remembered so the next session can deep-link.
+
+    Parameters:
+    driver : WebDriver instance, already signed in to Google Ads
+    account_id : str : Account id for the deep link
+    chip : int : Asset-type chip to select (13 is Location)
+    start_date, end_date : str : Optional date range for the deep link ('MM/DD/YYYY')
+    deep_link : bool : Try the deep link first
+    url_file : str : Where landed URLs are remembered, None to disable
+    """
+    if deep_link:
+        base_url = load_assets_url(url_file, account_id) if url_file else None
+        if base_url or account_id:
+            url = build_assets_url(base_url, account_id, start_date=start_date, end_date=end_date)
+            if navigate_by_link(driver, url, chip):
+                return
+            logging.info("Falling back to the navigation click path.")
+            driver.get(ADS_HOME_URL)
+
+    navigate_by_clicks(driver, chip, account_id)
+    if url_file:
+        remember_assets_url(driver.current_url, url_file, account_id)
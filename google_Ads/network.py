@@ -0,0 +1,150 @@
+import re
+import json
+import base64
+import logging
+
+from .waits import pagination_label
+from .pagination import parse_pagination_label
+
+
+# Requests whose responses carry the table rows. Only the local mock's endpoint
+# (mock_ads.py serves /api/rows) is known: the live Ads UI's data requests and
+# their payload layout have not been mapped, so network extraction is only
+# offered by the mock benchmark (mock_ads.py bench --backend network).
+DATA_URL_PATTERNS = [r"/api/rows(\?|$)"]
+
+# Cell text the table shows for a metric without a value (e.g. CTR without impressions)
+EMPTY_METRIC = "--"
+
+
+def enable_capture(options):
+    """
+    Turns on Chrome's performance log in `options`, which records the Network
+    events the data responses are found in. Only sessions that extract rows
+    from the network need it; the log is buffered until drain_responses reads it.
+    """
+    options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    options.add_experimental_option("perfLoggingPrefs", {"enableNetwork": True, "enablePage": False})
+
+
+def _matches(url, patterns):
+    return any(re.search(pattern, url) for pattern in patterns)
+
+
+def drain_responses(driver, patterns=DATA_URL_PATTERNS):
+    """
+    Reads (and empties) the performance log and fetches the bodies of the
+    finished JSON responses whose URL matches `patterns`.
+
+    Returns:
+    List of (url, payload) in the order the responses finished
+    """
+    urls = {}
+    finished = []
+    for entry in driver.get_log("performance"):
+        message = json.loads(entry["message"])["message"]
+        params = message.get("params", {})
+        if message["method"] == "Network.responseReceived":
+            response = params["response"]
+            if _matches(response["url"], patterns) and "json" in response.get("mimeType", ""):
+                urls[params["requestId"]] = response["url"]
+        elif message["method"] == "Network.loadingFinished" and params["requestId"] in urls:
+            finished.append(params["requestId"])
+
+    responses = []
+    for request_id in finished:
+        try:
+            body = driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": request_id})
+        except Exception as e:
+            logging.warning(f"⚠️ Could not read the response body of {urls[request_id]}: {e}")
+            continue
+        text = base64.b64decode(body["body"]).decode("utf-8") if body.get("base64Encoded") else body["body"]
+        try:
+            responses.append((urls[request_id], json.loads(text)))
+        except ValueError:
+            logging.warning(f"⚠️ Response of {urls[request_id]} is not JSON")
+    return responses
+
+
+def _number(n):
+    return f"{n:,}"
+
+
+def _money(micros):
+    return f"${micros / 1e6:,.2f}"
+
+
+# Column name -> cell text of a payload row, formatted like the table shows it
+CELL_FORMATTERS = {
+    "Clicks": lambda r: _number(r["clicks"]),
+    "Impr.": lambda r: _number(r["impressions"]),
+    "CTR": lambda r: f"{100 * r['clicks'] / r['impressions']:.2f}%" if r["impressions"] else EMPTY_METRIC,
+    "Avg. CPC": lambda r: _money(r["cost_micros"] / r["clicks"]) if r["clicks"] else EMPTY_METRIC,
+    "Cost": lambda r: _money(r["cost_micros"]),
+    "Conv.": lambda r: f"{r['conversions']:.2f}",
+}
+
+
+def _asset_text(asset):
+    """
+    The Asset cell as the DOM extraction reads it: the text of the asset div
+    (title and subtitle run together), then the title and subtitle divs.
+    """
+    texts = [asset.get("title") or "", asset.get("subtitle") or ""]
+    return " ".join(text for text in ["".join(texts)] + texts if text)
+
+
+def payload_rows(payload):
+    """
+    Decodes one data response into rows shaped like parsing.parse_rows: the
+    header row first, every row starting with the (empty) checkbox cell, so
+    that parsing.rows_to_dataframe builds the same DataFrame as for the DOM.
+    The layout ("columns", "rows", "asset", metric fields in micros) is the
+    mock's. Raises KeyError for a column or field the decoder does not know.
+    """
+    columns = payload["columns"]
+    rows = [[""] + list(columns)]
+    for row in payload["rows"]:
+        rows.append([""] + [_asset_text(row["asset"]) if column == "Asset" else CELL_FORMATTERS[column](row)
+                            for column in columns])
+    return rows
+
+
+def page_payload(responses, page_num, expected_rows, total_rows=None):
+    """
+    The latest response of `responses` that holds page `page_num` with the
+    number of rows the pagination label announces, or None.
+    """
+    for _, payload in reversed(responses):
+        if not isinstance(payload, dict) or "rows" not in payload:
+            continue
+        if payload.get("page", page_num) != page_num or len(payload["rows"]) != expected_rows:
+            continue
+        if total_rows is not None and payload.get("total", total_rows) != total_rows:
+            continue
+        return payload
+    return None
+
+
+def extract_rows_network(driver, page_num=1, patterns=DATA_URL_PATTERNS):
+    """
+    Returns the rows of the current page from the data response the table
+    was rendered from, in the same shape as parsing.parse_rows, without
+    scrolling or reading the DOM. The response is checked against the
+    pagination label: it must hold this page and exactly the rows the label
+    announces. Raises RuntimeError when no response passes, so the caller
+    can fall back to DOM extraction. Only the mock's responses are
+    recognized (see DATA_URL_PATTERNS).
+    """
+    parsed = parse_pagination_label(pagination_label(driver))
+    if not parsed:
+        raise RuntimeError("Pagination label not readable, cannot verify a data response")
+    first, last, total = parsed
+    expected_rows = last - first + 1 if total else 0
+    payload = page_payload(drain_responses(driver, patterns), page_num, expected_rows, total)
+    if payload is None:
+        raise RuntimeError(f"No data response with the {expected_rows} rows of page {page_num}")
+    try:
+        return payload_rows(payload)
+    except (KeyError, TypeError) as e:
+        raise RuntimeError(f"Unknown data response layout: {e!r}")
@@ -0,0 +1,64 @@
+import logging
+
+
+# Metric column -> target dtype (nullable, so placeholders can stay NA)
+METRIC_DTYPES = {
+    "Clicks": "Int32",
+    "Impr.": "Int32",
+    "CTR": "Float32",
+    "Avg. CPC": "Float32",
+    "Cost": "Float32",
+    "Conv.": "Float32",
+}
+
+# Cell values the Ads UI shows instead of a number
+PLACEHOLDERS = ["", "--", "—", "-", "N/A"]
+
+_INT32_MAX = 2 ** 31 - 1
+
+
+def normalize_metrics(df):
+    """
+    Converts the scraped metric strings into compact numeric columns and the
+    Asset column into a categorical, column by column with vectorized string
+    operations. Meant to run on a whole page or chunk at a time, not per cell.
+
+    '1,204' -> 1204, '$1,047.48' -> 1047.48, '2.49%' -> 2.49, '--' -> NA.
+    Numbers are expected in the US format the Ads UI uses for the account.
+
+    Returns:
+    (normalized_df, report) where report lists the cells that were not a
+    placeholder but could not be parsed (row, column, value)
+    """
+    import pandas as pd
+
+    df = df.copy()
+    problems = []
+
+    for column, dtype in METRIC_DTYPES.items():
+        if column not in df.columns:
+            continue
+        raw = df[column].astype("string").str.strip()
+        placeholder = raw.isna() | raw.isin(PLACEHOLDERS)
+        cleaned = raw.str.replace(r"[^0-9.\-]", "", regex=True).mask(placeholder)
+        numbers = pd.to_numeric(cleaned, errors="coerce")
+
+        failed = numbers.isna() & ~placeholder
+        if dtype == "Int32":
+            # Fractions or values beyond int32 are not valid counts
+            bad = numbers.notna() & ((numbers % 1 != 0) | (numbers.abs() > _INT32_MAX))
+            failed |= bad
+            numbers = numbers.mask(bad)
+        if failed.any():
+            problems.append(pd.DataFrame({"row": df.index[failed], "column": column, "value": raw[failed]}))
+        df[column] = numbers.astype(dtype)
+
+    if "Asset" in df.columns:
+        df["Asset"] = df["Asset"].astype("category")
+
+    report = (pd.concat(problems, ignore_index=True) if problems
+              else pd.DataFrame({"row": [], "column": [], "value": []}))
+    if len(report):
+        logging.warning(f"⚠️ {len(report)} metric cells could not be parsed, e.g. "
+                        f"{report.iloc[0]['column']}={report.iloc[0]['value']!r} in row {report.iloc[0]['row']}")
+    return df, report
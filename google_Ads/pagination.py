@@ -0,0 +1,116 @@
+import re
+import math
+import logging
+from selenium.webdriver.common.by import By
+from selenium.webdriver.common.keys import Keys
+from selenium.webdriver.common.action_chains import ActionChains
+
+from .waits import (
+    wait_for, try_wait_for, clickable, table_signature, table_rerendered,
+    pagination_label, pagination_label_changed,
+)
+from .timing import timed
+
+
+# "Show rows" selector of the pagination bar and the options of its open menu
+PAGE_SIZE_XPATH = "//pagination-bar//material-dropdown-select"
+PAGE_SIZE_OPTION_XPATH = "//material-select-dropdown-item | //material-select-item"
+DEFAULT_PAGE_SIZE = 50  # rows per page the Ads UI starts with
+MAX_PAGES = 500         # safety stop when the page count cannot be read from the label
+
+# '1 - 50 of 1,234' (also with an en dash and '.' as thousands separator)
+_LABEL_PATTERN = re.compile(r"([\d.,]+)\s*[-\u2013]\s*([\d.,]+)\s+of\s+([\d.,]+)")
+
+
+def parse_pagination_label(label):
+    """'51 - 100 of 321' -> (51, 100, 321), or None if the label has another shape."""
+    match = _LABEL_PATTERN.search(label or "")
+    if not match:
+        return None
+    return tuple(int(re.sub(r"[.,]", "", group)) for group in match.groups())
+
+
+def table_layout(driver):
+    """
+    Reads the row total and the page size from the pagination label of the
+    first page.
+
+    Returns:
+    (total_rows, page_size, page_count), or None if the label cannot be read
+    """
+    parsed = parse_pagination_label(pagination_label(driver))
+    if not parsed:
+        return None
+    first, last, total = parsed
+    if total == 0:
+        return 0, 0, 0
+    page_size = last - first + 1
+    return total, page_size, math.ceil(total / page_size)
+
+
+def _page_size_options(driver):
+    """Condition: the visible numeric options of the open rows-per-page menu as [(size, element)]."""
+    options = []
+    for element in driver.find_elements(By.XPATH, PAGE_SIZE_OPTION_XPATH):
+        text = element.text.strip()
+        if text.isdigit() and element.is_displayed():
+            options.append((int(text), element))
+    return options or False
+
+
+@timed("page_size")
+def maximize_page_size(driver):
+    """
+    Picks the largest option of the "Show rows" selector so that a date range
+    needs as few page round trips as possible.
+
+    Returns:
+    The rows per page now shown, or None if the table has no selector
+    """
+    selectors = driver.find_elements(By.XPATH, PAGE_SIZE_XPATH)
+    if not selectors:
+        logging.warning("⚠️ No rows-per-page selector found, keeping the page size")
+        return None
+    current = selectors[0].text.strip()
+    selectors[0].click()
+    size, option = max(wait_for(driver, _page_size_options, step="pagination"), key=lambda item: item[0])
+    if current == str(size):
+        ActionChains(driver).send_keys(Keys.ESCAPE).perform()
+    else:
+        previous_label = pagination_label(driver)
+        option.click()
+        try_wait_for(driver, pagination_label_changed(previous_label), step="pagination")
+    logging.info(f"✅ Showing {size} rows per page")
+    return size
+
+
+@timed("next_page")
+def next_page(driver, next_page_xpath):
+    """
+    Clicks the pagination "next" button and waits for the next page to render.
+    Raises if the button is not clickable (last page) or nothing changes.
+    """
+    next_button = clickable(driver, next_page_xpath, step="pagination", timeout=5)
+    previous_label = pagination_label(driver)
+    previous_signature = table_signature(driver)
+    next_button.click()
+    # Wait for the next page: label change first, table re-render as fallback
+    if not try_wait_for(driver, pagination_label_changed(previous_label), step="pagination"):
+        wait_for(driver, table_rerendered(previous_signature), step="table_render")
+
+
+def skip_pages(driver, next_page_xpath, count):
+    """Moves `count` pages forward without extracting them (used to resume a chunk)."""
+    for _ in range(count):
+        next_page(driver, next_page_xpath)
+    if count:
+        logging.info(f"Skipped {count} already finished pages")
+
+
+@timed("first_page")
+def first_page(driver, first_page_xpath):
+    """Clicks the pagination "first page" button and waits for the label to change."""
+    previous_label = pagination_label(driver)
+    clickable(driver, first_page_xpath, step="pagination", timeout=5).click()
+    try_wait_for(driver, pagination_label_changed(previous_label), step="pagination")
+    logging.info("Back to first page")
@@ -0,0 +1,309 @@
+import re
+import json
+import logging
+import argparse
+import importlib.util
+
+# The HTML libraries and pandas are imported on first use, so that importing
+# this module (e.g. to list PARSERS for a command line) stays cheap.
+
+
+# Positional ess-cell columns of the asset table -> column names
+COLUMN_NAMES = {
+    "1": "Asset",
+    "2": "Clicks",
+    "3": "Impr.",
+    "4": "CTR",
+    "5": "Avg. CPC",
+    "6": "Cost"
+}
+
+# First data cell of the table's summary row ("Total: Account", "Total: Filtered ...")
+SUMMARY_CELL = re.compile(r"^Total\b\s*:")
+
+def _join_cell(div_texts):
+    """A cell is the non-empty texts of its divs joined by a space."""
+    return " ".join(text for text in div_texts if text)
+
+
+# ---------------------------------------------------------------------------
+# html.parser (BeautifulSoup) backend
+# ---------------------------------------------------------------------------
+
+def _bs4_collect(node, out, text_types):
+    """
+    Returns get_text(strip=True) of `node` and appends the text of every div
+    below it to `out` in document order, visiting each node once.
+    `text_types` are the string types get_text() returns (no comments, doctypes, ...).
+    """
+    slot = None
+    if node.name == "div":
+        slot = len(out)
+        out.append("")
+    parts = []
+    for child in node.children:
+        if type(child) in text_types:
+            text = child.strip()
+            if text:
+                parts.append(text)
+        elif child.name is not None:
+            parts.append(_bs4_collect(child, out, text_types))
+    text = "".join(parts)
+    if slot is not None:
+        out[slot] = text
+    return text
+
+
+def _bs4_cell_text(cell, text_types):
+    div_texts = []
+    for child in cell.children:
+        if child.name is not None:
+            _bs4_collect(child, div_texts, text_types)
+    return _join_cell(div_texts)
+
+
+def _parse_rows_bs4(html):
+    from bs4 import BeautifulSoup, CData, NavigableString
+
+    text_types = (NavigableString, CData)
+    soup = BeautifulSoup(html, "html.parser")
+    data = []
+    for row in soup.find_all("div", {"role": "row"}):
+        row_data = [_bs4_cell_text(cell, text_types) for cell in row.find_all("ess-cell")]
+        if row_data:
+            data.append(row_data)
+    return data
+
+
+# ---------------------------------------------------------------------------
+# lxml backend
+# ---------------------------------------------------------------------------
+
+def _strip(text):
+    return text.strip() if text else ""
+
+
+def _lxml_collect(element, out):
+    slot = None
+    if element.tag == "div":
+        slot = len(out)
+        out.append("")
+    parts = [_strip(element.text)]
+    for child in element:
+        if isinstance(child.tag, str):  # comments/PIs only contribute their tail
+            parts.append(_lxml_collect(child, out))
+        parts.append(_strip(child.tail))
+    text = "".join(parts)
+    if slot is not None:
+        out[slot] = text
+    return text
+
+
+def _lxml_cell_text(cell):
+    div_texts = []
+    for child in cell:
+        if isinstance(child.tag, str):
+            _lxml_collect(child, div_texts)
+    return _join_cell(div_texts)
+
+
+def _parse_rows_lxml(html):
+    import lxml.html
+
+    root = lxml.html.fromstring(html)
+    data = []
+    for row in root.iter("div"):
+        if row.get("role") != "row":
+            continue
+        row_data = [_lxml_cell_text(cell) for cell in row.iterdescendants("ess-cell")]
+        if row_data:
+            data.append(row_data)
+    return data
+
+
+# ---------------------------------------------------------------------------
+# selectolax (lexbor) backend
+# ---------------------------------------------------------------------------
+
+def _lexbor_collect(node, out):
+    slot = None
+    if node.tag == "div":
+        slot = len(out)
+        out.append("")
+    parts = []
+    for child in node.iter(include_text=True):
+        if child.tag == "-text":
+            text = _strip(child.text_content)
+            if text:
+                parts.append(text)
+        elif not child.tag.startswith(("-", "_", "!")):  # skip comments/doctype
+            parts.append(_lexbor_collect(child, out))
+    text = "".join(parts)
+    if slot is not None:
+        out[slot] = text
+    return text
+
+
+def _lexbor_cell_text(cell):
+    div_texts = []
+    for child in cell.iter(include_text=False):
+        if not child.tag.startswith(("-", "_", "!")):
+            _lexbor_collect(child, div_texts)
+    return _join_cell(div_texts)
+
+
+def _parse_rows_lexbor(html):
+    from selectolax.lexbor import LexborHTMLParser
+
+    tree = LexborHTMLParser(html)
+    data = []
+    for row in tree.root.traverse(include_text=False):
+        if row.tag != "div" or row.attributes.get("role") != "row":
+            continue
+        row_data = [_lexbor_cell_text(cell) for cell in row.traverse(include_text=False)
+                    if cell.tag == "ess-cell"]
+        if row_data:
+            data.append(row_data)
+    return data
+
+
+def _installed(module):
+    try:
+        return importlib.util.find_spec(module) is not None
+    except ImportError:  # parent package missing
+        return False
+
+
+# Backend name -> row parser. Optional backends are only listed when installed.
+PARSERS = {"html.parser": _parse_rows_bs4}
+if _installed("lxml.html"):
+    PARSERS["lxml"] = _parse_rows_lxml
+if _installed("selectolax.lexbor"):
+    PARSERS["selectolax"] = _parse_rows_lexbor
+
+# Fastest installed backend
+DEFAULT_PARSER = next(name for name in ("selectolax", "lxml", "html.parser") if name in PARSERS)
+
+
+def parse_rows(html, parser=None):
+    """
+    Parses table HTML into a list of rows (lists of cell texts).
+    Rows without any ess-cell are skipped.
+
+    Parameters:
+    html : str : Table HTML (e.g. the table div's outerHTML)
+    parser : str : Backend name from PARSERS, defaults to DEFAULT_PARSER
+    """
+    parser = parser or DEFAULT_PARSER
+    if parser not in PARSERS:
+        raise ValueError(f"Unknown or unavailable parser '{parser}', available: {', '.join(PARSERS)}")
+    return PARSERS[parser](html)
+
+
+def parse_rows_reference(html):
+    """
+    The original extraction loop, kept verbatim as the parity reference:
+    find_all("ess-cell") -> find_all("div") -> get_text(strip=True).
+    """
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "html.parser")
+    data = []
+    for row in soup.find_all("div", {"role": "row"}):
+        cells = row.find_all("ess-cell")  # Target all <ess-cell> elements
+        row_data = []
+
+        for cell in cells:
+            divs = cell.find_all("div")
+            cell_text = " ".join(div.get_text(strip=True) for div in divs if div.get_text(strip=True))
+            row_data.append(cell_text)
+
+        if row_data:
+            data.append(row_data)
+    return data
+
+
+def _is_header(row):
+    """
+    The header row has an empty checkbox cell and only column names after it:
+    text with letters and without digits, which every data row has somewhere.
+    """
+    names = [cell for cell in row[1:] if cell]
+    return (len(row) > 1 and not row[0] and len(names) >= 2
+            and all(any(c.isalpha() for c in name) and not any(c.isdigit() for c in name) for name in names))
+
+
+def is_summary_row(row):
+    """
+    The summary row (particle-table-summary) under the data rows: its first
+    cell after the checkbox holds the "Total: ..." label. It repeats on every
+    page and is not an asset.
+    """
+    return len(row) > 1 and bool(SUMMARY_CELL.match(row[1]))
+
+
+def split_header(data):
+    """
+    Separates the table's header row from the data rows.
+
+    Returns:
+    (column_names, rows) where column_names is None if the first row is not a header
+    """
+    if data and _is_header(data[0]):
+        return data[0], data[1:]
+    return None, data
+
+
+def rows_to_dataframe(data):
+    """
+    Builds the asset DataFrame from parsed rows, dropping column 0 (the
+    checkbox) and naming the rest. Columns are named after the table's header
+    row when it is among the rows, so every asset type keeps its own columns;
+    without one, positions 1..6 are named as in COLUMN_NAMES. Summary rows
+    are dropped, so the row count matches the pagination label.
+    """
+    import pandas as pd
+
+    header, data = split_header(data)
+    data = [row for row in data if not is_summary_row(row)]
+    df = pd.DataFrame(data)
+    df.columns = df.columns.astype(str)  # Ensure column names are strings
+
+    # Drop column "0" if it exists
+    if "0" in df.columns:
+        df = df.drop(columns=["0"])
+
+    # Rename columns
+    if header:
+        return df.rename(columns={str(i): name for i, name in enumerate(header) if i and name})
+    return df.rename(columns=COLUMN_NAMES)
+
+
+def check_parity(paths):
+    """
+    Parses every fixture with the reference loop and every installed backend
+    and compares the JSON-serialized rows byte for byte.
+
+    Returns:
+    True if all backends match the reference on all fixtures
+    """
+    ok = True
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            html = f.read()
+        expected = json.dumps(parse_rows_reference(html), ensure_ascii=False).encode("utf-8")
+        for name in PARSERS:
+            actual = json.dumps(parse_rows(html, name), ensure_ascii=False).encode("utf-8")
+            if actual == expected:
+                logging.info(f"✅ {path}: {name} matches the reference")
+            else:
+                logging.error(f"❌ {path}: {name} differs from the reference")
+                ok = False
+    return ok
+
+
+def main(argv=None, prog=None):
+    parser = argparse.ArgumentParser(prog=prog, description="Check every parser backend against the reference loop.")
+    parser.add_argument("paths", nargs="+", help="Saved table HTML, e.g. fixtures/*.html")
+    args = parser.parse_args(argv)
+    return 0 if check_parity(args.paths) else 1
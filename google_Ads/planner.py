@@ -0,0 +1,310 @@
+import os
+import glob
+import json
+import logging
+import argparse
+from datetime import datetime, timedelta
+
+from .manifest import MANIFEST_DIR, DONE, chunk_key, load_chunk
+
+
+DEFAULT_START = "1/6/2025"
+DEFAULT_END = "1/26/2025"
+
+# How a date range is split into chunks (one browser date selection and output each)
+CHUNKINGS = ("weekly", "none", "adaptive")
+
+# Adaptive chunking: windows are sized so a chunk takes at most PAGE_BUDGET pages
+PAGE_BUDGET = 10
+HEADROOM = 0.8            # share of the budget an estimate may fill, volume can grow since it was seen
+INITIAL_PAGE_SIZE = 50    # rows per page before the page size is known (pagination.DEFAULT_PAGE_SIZE)
+
+
+def break_into_weekly_chunks(start_date, end_date):
+    """
+    Breaks a date range into chunks from Monday to Sunday.
+
+    Parameters:
+    start_date : str : Start date in 'MM/DD/YYYY' format
+    end_date : str : End date in 'MM/DD/YYYY' format
+
+    Returns:
+    List of date range tuples in 'MM/DD/YYYY' format
+    """
+
+    # Convert string dates to datetime objects
+    start = datetime.strptime(start_date, "%m/%d/%Y")
+    end = datetime.strptime(end_date, "%m/%d/%Y")
+
+    result = []
+    current_start = start
+
+    while current_start <= end:
+        # Find the next Sunday
+        next_sunday = current_start + timedelta(days=(6 - current_start.weekday()))
+
+        # Ensure we don't go past the end date
+        current_end = min(next_sunday, end)
+
+        # Append the chunk
+        result.append((current_start.strftime("%m/%d/%Y"), current_end.strftime("%m/%d/%Y")))
+
+        # Move to the next Monday
+        current_start = current_end + timedelta(days=1)
+
+    return result
+
+
+def _fixed_chunks(start_date, end_date, chunking):
+    if chunking == "weekly":
+        return break_into_weekly_chunks(start_date, end_date)
+    if chunking == "none":
+        start, end = (datetime.strptime(d, "%m/%d/%Y").strftime("%m/%d/%Y") for d in (start_date, end_date))
+        return [(start, end)]
+    raise ValueError(f"Unknown chunking '{chunking}', expected one of {', '.join(CHUNKINGS)}")
+
+
+def _date(text):
+    return datetime.strptime(text, "%m/%d/%Y")
+
+
+def _window(start, end):
+    return start.strftime("%m/%d/%Y"), end.strftime("%m/%d/%Y")
+
+
+def _days(window):
+    return (_date(window[1]) - _date(window[0])).days + 1
+
+
+def break_into_monthly_chunks(start_date, end_date):
+    """Breaks a date range into calendar months, clipped to the range. Same format as break_into_weekly_chunks."""
+    current_start = _date(start_date)
+    end = _date(end_date)
+    result = []
+    while current_start <= end:
+        next_month = (current_start.replace(day=1) + timedelta(days=32)).replace(day=1)
+        current_end = min(next_month - timedelta(days=1), end)
+        result.append(_window(current_start, current_end))
+        current_start = current_end + timedelta(days=1)
+    return result
+
+
+def break_into_daily_chunks(start_date, end_date):
+    """One chunk per day of the range."""
+    start = _date(start_date)
+    return [_window(start + timedelta(days=i), start + timedelta(days=i))
+            for i in range((_date(end_date) - start).days + 1)]
+
+
+def observed_volume(manifest_dirs):
+    """
+    Row counts of the chunks finished by earlier runs, read from their
+    manifest records: the label's row total where it was recorded, else the
+    rows written.
+
+    Returns:
+    (observations, page_size): a list of (date_chunk, rows) and the largest
+    page size recorded, or None if no record has one
+    """
+    observations = []
+    page_size = None
+    for manifest_dir in manifest_dirs:
+        for path in glob.glob(os.path.join(manifest_dir, "*.json")):
+            try:
+                with open(path, encoding="utf-8") as f:
+                    record = json.load(f)
+                if record["status"] != DONE:
+                    continue
+                observations.append(((record["start_date"], record["end_date"]),
+                                     record.get("expected_rows", record["rows"])))
+            except (OSError, ValueError, KeyError):
+                continue  # a record being written or from another tool
+            if record.get("page_size"):
+                page_size = max(page_size or 0, record["page_size"])
+    return observations, page_size
+
+
+def history_estimator(observations):
+    """
+    Estimates the rows of a window from observed chunks, spreading each
+    chunk's rows evenly over its days (the busiest observation wins where
+    chunks overlap). The estimate is None when some day was never observed.
+    """
+    daily = {}
+    for date_chunk, rows in observations:
+        rate = rows / _days(date_chunk)
+        start = _date(date_chunk[0])
+        for i in range(_days(date_chunk)):
+            day = start + timedelta(days=i)
+            daily[day] = max(daily.get(day, 0), rate)
+
+    def estimate(date_chunk):
+        start = _date(date_chunk[0])
+        days = [start + timedelta(days=i) for i in range(_days(date_chunk))]
+        if not all(day in daily for day in days):
+            return None
+        return round(sum(daily[day] for day in days))
+    return estimate
+
+
+def recorded_windows(manifest_dir, start_date, end_date):
+    """
+    The chunks recorded in `manifest_dir` if they cover the date range
+    exactly, without gaps or overlaps; None otherwise. Lets a resumed
+    adaptive run keep the windows it started with.
+    """
+    start, end = _date(start_date), _date(end_date)
+    windows = []
+    for path in glob.glob(os.path.join(manifest_dir, "*.json")):
+        try:
+            with open(path, encoding="utf-8") as f:
+                record = json.load(f)
+            window = (record["start_date"], record["end_date"])
+        except (OSError, ValueError, KeyError):
+            continue
+        if start <= _date(window[0]) and _date(window[1]) <= end:
+            windows.append(window)
+    windows.sort(key=lambda window: _date(window[0]))
+
+    expected = start
+    for window in windows:
+        if _date(window[0]) != expected:
+            return None
+        expected = _date(window[1]) + timedelta(days=1)
+    return windows if windows and expected == end + timedelta(days=1) else None
+
+
+def plan_adaptive_windows(start_date, end_date, estimate, row_budget):
+    """
+    Splits a date range into the fewest windows whose estimated rows fit the
+    row budget. Each calendar month is tried whole, a month over budget is
+    split into weeks, a week over budget into days; adjacent windows of a
+    month are then merged again while their sum still fits. A month of
+    unknown volume falls back to weekly windows; days are never split or
+    estimated on their own (they get their week's average).
+
+    Weeks are the Monday-to-Sunday windows of break_into_weekly_chunks over
+    the whole range, so the last week of a month may reach into the next
+    one (which then starts after it). Without any history the plan is
+    exactly the weekly one, and keeps its manifest and cache keys.
+
+    Parameters:
+    start_date, end_date : str : Date range in 'MM/DD/YYYY' format
+    estimate : callable : estimate(date_chunk) -> expected rows, or None if unknown
+    row_budget : int : Rows one chunk may take, e.g. pages per chunk * page size
+
+    Returns:
+    List of (date_chunk, estimated rows or None)
+    """
+    limit = row_budget * HEADROOM
+    windows = []
+    covered_until = _date(start_date) - timedelta(days=1)
+    for month in break_into_monthly_chunks(start_date, end_date):
+        if _date(month[1]) <= covered_until:
+            continue  # taken by a week reaching in from the month before
+        month = _window(max(_date(month[0]), covered_until + timedelta(days=1)), _date(month[1]))
+        rows = estimate(month)
+        if rows is not None and rows <= limit:
+            windows.append((month, rows))
+            covered_until = _date(month[1])
+            continue
+
+        pieces = []
+        for week in break_into_weekly_chunks(month[0], end_date):
+            if _date(week[0]) > _date(month[1]):
+                break
+            covered_until = _date(week[1])
+            week_rows = estimate(week)
+            if week_rows is None or week_rows <= limit:
+                pieces.append((week, week_rows))
+                continue
+            for day in break_into_daily_chunks(*week):
+                day_rows = round(week_rows / _days(week))
+                if day_rows > limit:
+                    logging.warning(f"⚠️ {day[0]} alone is expected to have {day_rows} rows, "
+                                    f"more than the budget of {row_budget}")
+                pieces.append((day, day_rows))
+
+        # Merge neighbours of known volume while they fit
+        for window, window_rows in pieces:
+            if windows and window_rows is not None and windows[-1][1] is not None \
+                    and _date(windows[-1][0][0]).month == _date(window[0]).month \
+                    and windows[-1][1] + window_rows <= limit:
+                previous, previous_rows = windows.pop()
+                window, window_rows = (previous[0], window[1]), previous_rows + window_rows
+            windows.append((window, window_rows))
+    return windows
+
+
+def adaptive_estimate(manifest_dirs, page_budget=PAGE_BUDGET, probe=None, page_size=None):
+    """
+    Estimator and row budget of adaptive chunking, from the manifests of
+    earlier runs. Windows without history are measured with `probe` when
+    given, e.g. by reading the table's row total for the window.
+
+    Parameters:
+    manifest_dirs : list : Manifest directories whose finished chunks are the history
+    page_budget : int : Pages one chunk may take
+    probe : callable : probe(date_chunk) -> (rows, page_size) or None
+    page_size : int : Rows per page the table shows now, e.g. read by a probe; the
+                      larger of it and the recorded page size sizes the budget
+
+    Returns:
+    (estimate, row_budget) for plan_date_chunks
+    """
+    observations, recorded_page_size = observed_volume(manifest_dirs)
+    from_history = history_estimator(observations)
+
+    def estimate(date_chunk):
+        rows = from_history(date_chunk)
+        if rows is None and probe is not None:
+            probed = probe(date_chunk)
+            rows = probed[0] if probed else None
+        return rows
+    page_size = max(page_size or 0, recorded_page_size or 0) or INITIAL_PAGE_SIZE
+    return estimate, page_budget * page_size
+
+
+def plan_date_chunks(start_date, end_date, chunking="weekly", estimate=None, row_budget=None):
+    """
+    Splits a date range into the chunks a run scrapes.
+
+    Parameters:
+    start_date : str : Start date in 'MM/DD/YYYY' format
+    end_date : str : End date in 'MM/DD/YYYY' format
+    chunking : str : "weekly" (Monday to Sunday), "none" (the whole range at once)
+                     or "adaptive" (daily to monthly windows sized by row volume)
+    estimate : callable : Adaptive: estimate(date_chunk) -> rows or None, see history_estimator
+    row_budget : int : Adaptive: rows one chunk may take
+    """
+    if chunking == "adaptive":
+        windows = plan_adaptive_windows(start_date, end_date, estimate or (lambda date_chunk: None),
+                                        row_budget or PAGE_BUDGET * INITIAL_PAGE_SIZE)
+        return [window for window, _ in windows]
+    return _fixed_chunks(start_date, end_date, chunking)
+
+
+def main(argv=None, prog=None):
+    parser = argparse.ArgumentParser(prog=prog, description="Show the date chunks of a run and their manifest status.")
+    parser.add_argument("--start", default=DEFAULT_START, help="Start date in MM/DD/YYYY format")
+    parser.add_argument("--end", default=DEFAULT_END, help="End date in MM/DD/YYYY format")
+    parser.add_argument("--chunking", choices=CHUNKINGS, default="weekly")
+    parser.add_argument("--manifest-dir", default=MANIFEST_DIR, help="Directory of the run manifest")
+    parser.add_argument("--page-budget", type=int, default=PAGE_BUDGET,
+                        help="adaptive: pages one chunk may take, sized from the row counts in the manifest")
+    args = parser.parse_args(argv)
+
+    if args.chunking == "adaptive":
+        estimate, row_budget = adaptive_estimate([args.manifest_dir], args.page_budget)
+        windows = plan_adaptive_windows(args.start, args.end, estimate, row_budget)
+        print(f"Row budget per chunk: {row_budget}")
+    else:
+        windows = [(date_chunk, None) for date_chunk in plan_date_chunks(args.start, args.end, args.chunking)]
+
+    for date_chunk, estimated_rows in windows:
+        record = load_chunk(args.manifest_dir, date_chunk)
+        status = f"{record['status']}, {record['rows']} rows" if record else "not planned"
+        if args.chunking == "adaptive":
+            status += f", ~{estimated_rows} rows expected" if estimated_rows is not None else ", volume unknown"
+        print(f"{chunk_key(date_chunk)}  {status}")
+    return 0
@@ -0,0 +1,146 @@
+import os
+import queue
+import logging
+import threading
+import multiprocessing
+
+from .browser import create_driver
+from .recovery import run_with_restarts
+
+
+LOG_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+
+
+def _worker_log_handler(name, log_dir):
+    """Adds a per-worker log file (log_dir/<worker>.log) to the root logger."""
+    os.makedirs(log_dir, exist_ok=True)
+    handler = logging.FileHandler(os.path.join(log_dir, f"{name}.log"), encoding="utf-8")
+    handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    # Only records emitted by this worker's thread/process
+    handler.addFilter(lambda record: name in (record.threadName, record.processName))
+    logging.getLogger().addHandler(handler)
+    return handler
+
+
+def _run_worker(name, work_queue, report, setup_session, scrape_chunk, log_dir, driver_factory=create_driver):
+    """
+    Worker loop: opens one Chrome session, prepares it once and scrapes chunks
+    from the queue until it is empty. A browser that crashes is replaced and
+    the chunk retried (see recovery.run_with_restarts). Each finished chunk is
+    passed to `report(index, chunk, output, error)`.
+    """
+    handler = _worker_log_handler(name, log_dir) if log_dir else None
+    driver = None
+    try:
+        driver = driver_factory()
+        setup_session(driver)
+        logging.info(f"[{name}] Session ready")
+        while True:
+            try:
+                index, chunk = work_queue.get_nowait()
+            except queue.Empty:
+                break
+            logging.info(f"[{name}] Scraping chunk {index}: {chunk}")
+            driver, output, error = run_with_restarts(driver, chunk, scrape_chunk, driver_factory, setup_session)
+            if error:
+                logging.error(f"[{name}] ❌ Chunk {chunk} failed: {error}")
+            report(index, chunk, output, error)
+            if driver is None:
+                break  # no browser to go on with, the remaining chunks stay "not scraped"
+    except Exception as e:
+        logging.error(f"[{name}] ❌ Worker failed: {e}")
+    finally:
+        if driver is not None:
+            driver.quit()
+        logging.info(f"[{name}] Browser closed.")
+        if handler:
+            logging.getLogger().removeHandler(handler)
+            handler.close()
+
+
+def _process_worker(name, work_queue, result_queue, setup_session, scrape_chunk, log_dir, driver_factory):
+    # A spawned process starts with an unconfigured root logger (WARNING, no
+    # handlers): set it up like cli.main does, or the worker log stays empty
+    logging.basicConfig(level=logging.INFO, format=LOG_FORMAT)
+
+    def report(index, chunk, output, error):
+        result_queue.put((index, chunk, output, error))
+    _run_worker(name, work_queue, report, setup_session, scrape_chunk, log_dir, driver_factory)
+
+
+def run_pool(chunks, setup_session, scrape_chunk, workers=2, mode="thread", log_dir="logs",
+             driver_factory=create_driver):
+    """
+    Spreads chunks across `workers` independent Chrome sessions.
+
+    Parameters:
+    chunks : list : Work items (e.g. date range tuples)
+    setup_session : callable : setup_session(driver), run once per session
+                               (login, navigation, filters)
+    scrape_chunk : callable : scrape_chunk(driver, chunk) -> output path or None
+    workers : int : Number of browser sessions
+    mode : str : "thread" (one driver per thread) or "process" (one per process).
+                 In process mode both callables must be importable module-level functions.
+    log_dir : str : Directory for per-worker log files, None to disable
+    driver_factory : callable : Starts a WebDriver for each worker (must be picklable in process mode)
+
+    Returns:
+    List of (chunk, output, error) in the order of `chunks`, regardless of
+    which worker finished first.
+    """
+    workers = max(1, min(workers, len(chunks)))
+    results = [(chunk, None, "not scraped") for chunk in chunks]
+
+    if mode == "process":
+        ctx = multiprocessing.get_context("spawn")
+        work_queue, result_queue = ctx.Queue(), ctx.Queue()
+        for item in enumerate(chunks):
+            work_queue.put(item)
+        processes = [
+            ctx.Process(target=_process_worker, name=f"worker-{i + 1}",
+                        args=(f"worker-{i + 1}", work_queue, result_queue, setup_session, scrape_chunk, log_dir,
+                              driver_factory))
+            for i in range(workers)
+        ]
+        for process in processes:
+            process.start()
+        # Drain results while the workers run so the queue never fills up
+        pending = len(chunks)
+        while pending and any(p.is_alive() for p in processes):
+            try:
+                index, chunk, output, error = result_queue.get(timeout=1)
+            except queue.Empty:
+                continue
+            results[index] = (chunk, output, error)
+            pending -= 1
+        for process in processes:
+            process.join()
+        while not result_queue.empty():
+            index, chunk, output, error = result_queue.get()
+            results[index] = (chunk, output, error)
+    elif mode == "thread":
+        work_queue = queue.Queue()
+        for item in enumerate(chunks):
+            work_queue.put(item)
+        lock = threading.Lock()
+
+        def report(index, chunk, output, error):
+            with lock:
+                results[index] = (chunk, output, error)
+
+        threads = [
+            threading.Thread(target=_run_worker, name=f"worker-{i + 1}",
+                             args=(f"worker-{i + 1}", work_queue, report, setup_session, scrape_chunk, log_dir,
+                                   driver_factory))
+            for i in range(workers)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    else:
+        raise ValueError(f"Unknown pool mode '{mode}', use 'thread' or 'process'")
+
+    done = sum(1 for _, output, error in results if error is None)
+    logging.info(f"Pool finished: {done}/{len(chunks)} chunks scraped with {workers} sessions")
+    return results
@@ -0,0 +1,136 @@
+import time
+import random
+import logging
+from selenium.common.exceptions import (
+    WebDriverException, TimeoutException, StaleElementReferenceException, InvalidSessionIdException,
+    NoSuchWindowException,
+)
+
+from .session import is_signed_out
+from .timing import span, count
+
+
+# Error classes
+STALE = "stale"            # an element was re-rendered under us
+TIMEOUT = "timeout"        # a wait ran out: slow UI, spinner, lost click
+UI = "ui"                  # other interaction errors (click intercepted, element missing)
+LOGGED_OUT = "logged_out"  # Google bounced the session to the sign-in page
+CRASHED = "crashed"        # the tab or the browser is gone, only a new browser helps
+FATAL = "fatal"            # not a browser problem (bug, bad data): never retried
+
+# Errors the session recovers from in place by rebuilding the table state
+RECOVERABLE = (STALE, TIMEOUT, UI, LOGGED_OUT)
+
+RECOVERY_ATTEMPTS = 3      # tries of one step, the first included
+BACKOFF_SECONDS = 2        # pause before the first retry, doubled for every further one
+BACKOFF_MAX_SECONDS = 30
+BROWSER_RESTARTS = 1       # new browsers per work item after a crash
+
+_CRASH_MESSAGES = ("tab crashed", "session deleted", "chrome not reachable", "disconnected",
+                   "target window already closed", "no such window", "invalid session id")
+
+
+def classify_error(driver, error):
+    """
+    Sorts an exception raised while scraping into one of the error classes
+    above. The browser is asked where it is, which tells a bounce to the
+    sign-in page from a slow UI and a dead browser from a live one.
+    """
+    message = str(error).lower()
+    if isinstance(error, (InvalidSessionIdException, NoSuchWindowException)) \
+            or any(text in message for text in _CRASH_MESSAGES):
+        return CRASHED
+    try:
+        if is_signed_out(driver):
+            return LOGGED_OUT  # whatever failed, it failed because the page is gone
+    except WebDriverException:
+        return CRASHED
+    if not isinstance(error, WebDriverException):
+        return FATAL
+    if isinstance(error, StaleElementReferenceException):
+        return STALE
+    if isinstance(error, TimeoutException):
+        return TIMEOUT
+    return UI
+
+
+def backoff_delay(attempt):
+    """Pause before retry number `attempt` (1-based): exponential with jitter, capped."""
+    delay = min(BACKOFF_SECONDS * 2 ** (attempt - 1), BACKOFF_MAX_SECONDS)
+    return delay * random.uniform(0.8, 1.2)
+
+
+def with_recovery(driver, action, recover, attempts=RECOVERY_ATTEMPTS, what="step"):
+    """
+    Runs `action()` and retries it after recoverable errors: waits with
+    backoff, calls `recover(error_class)` to rebuild the session state and
+    tries again, up to `attempts` tries in total. Crashes, fatal errors and
+    the last failure are raised.
+
+    Parameters:
+    driver : WebDriver instance the action works on
+    action : callable : action() -> result
+    recover : callable : recover(error_class), brings the page back to where `action` expects it
+    attempts : int : Tries in total, the first included
+    what : str : Name of the step in the logs
+    """
+    for attempt in range(1, attempts + 1):
+        try:
+            return action()
+        except Exception as e:
+            kind = classify_error(driver, e)
+            if kind not in RECOVERABLE or attempt == attempts:
+                raise
+            delay = backoff_delay(attempt)
+            reason = str(e).strip().splitlines()[0] if str(e).strip() else e.__class__.__name__
+            logging.warning(f"🔁 {what}: {kind} error ({reason}), recovering in {delay:.1f}s "
+                            f"(retry {attempt}/{attempts - 1})")
+            time.sleep(delay)
+            with span("recovery", kind=kind):
+                count("recoveries")
+                try:
+                    recover(kind)
+                except Exception as recover_error:
+                    # The next try fails (and is classified) again if the page is still broken
+                    logging.warning(f"⚠️ Recovery after {kind} error failed: {recover_error}")
+
+
+def restart_browser(driver, driver_factory, setup_session):
+    """Replaces a crashed browser: quits what is left of it, then starts and prepares a new one."""
+    try:
+        driver.quit()
+    except Exception:
+        pass  # already gone
+    count("browser_restarts")
+    driver = driver_factory()
+    try:
+        setup_session(driver)
+    except Exception:
+        driver.quit()
+        raise
+    return driver
+
+
+def run_with_restarts(driver, item, work, driver_factory, setup_session, restarts=BROWSER_RESTARTS):
+    """
+    Runs `work(driver, item)` and, if the browser crashes, retries it in a
+    new, prepared browser up to `restarts` times. Work that keeps its
+    progress (like a chunk and its manifest) continues where it stopped.
+
+    Returns:
+    (driver, result, error): the driver to keep using (a new one after a
+    restart, None if none could be started) and the result, or the error
+    message if the work failed
+    """
+    for restart in range(restarts + 1):
+        try:
+            return driver, work(driver, item), None
+        except Exception as e:
+            if restart == restarts or classify_error(driver, e) != CRASHED:
+                return driver, None, str(e)
+            logging.warning(f"💥 Browser lost while working on {item}, starting a new one "
+                            f"({restart + 1}/{restarts}): {e}")
+            try:
+                driver = restart_browser(driver, driver_factory, setup_session)
+            except Exception as restart_error:
+                return None, None, f"{e} (browser restart failed: {restart_error})"
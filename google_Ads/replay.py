@@ -0,0 +1,224 @@
+import os
+import glob
+import json
+import time
+import logging
+import argparse
+
+from .parsing import PARSERS, DEFAULT_PARSER, parse_rows, rows_to_dataframe
+from .normalize import normalize_metrics
+
+
+CAPTURE_DIR = "captures"
+BENCH_REPEAT = 3  # best of this many timed passes per backend
+
+# Backend name of the captured in-page (JS) rows in benchmark reports
+CAPTURED_JS = "js (captured)"
+
+
+def capture_page(capture_dir, driver, table_div, page_num=None, date_chunk=None, rows=None, source="html",
+                 scroll_steps=None):
+    """
+    Saves a snapshot of the table as it is on screen: its outerHTML as
+    page-NNN.html and the metadata (and the extracted rows, if any) as
+    page-NNN.json. Snapshots can then be replayed without a browser.
+
+    Parameters:
+    capture_dir : str : Directory of the snapshots, e.g. one per date chunk
+    driver : WebDriver instance
+    table_div : WebElement : The scrolled table element
+    page_num : int : Pagination page, defaults to the next free number
+    date_chunk : tuple : (start_date, end_date) the table is filtered on
+    rows : list : Rows extracted on the page, stored to compare replays against
+    source : str : How `rows` were extracted ("js", "html" or "harvest")
+    scroll_steps : int : Scroll steps it took to render the table
+
+    Returns:
+    Path of the HTML snapshot
+    """
+    os.makedirs(capture_dir, exist_ok=True)
+    if page_num is None:
+        page_num = len(glob.glob(os.path.join(capture_dir, "page-*.html"))) + 1
+    base = os.path.join(capture_dir, f"page-{page_num:03d}")
+
+    html = table_div.get_attribute("outerHTML")
+    with open(f"{base}.html", "w", encoding="utf-8") as f:
+        f.write(html)
+
+    meta = {
+        "captured_at": time.time(),
+        "url": driver.current_url,
+        "page": page_num,
+        "start_date": date_chunk[0] if date_chunk else None,
+        "end_date": date_chunk[1] if date_chunk else None,
+        "scroll_steps": scroll_steps,
+        "html_bytes": len(html.encode("utf-8")),
+        "source": source,
+        "rows": rows,
+    }
+    with open(f"{base}.json", "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False)
+    logging.info(f"📸 Captured {base}.html ({len(rows) if rows is not None else '?'} rows)")
+    return f"{base}.html"
+
+
+def load_snapshots(capture_dir):
+    """
+    Yields the snapshots below `capture_dir` in path order as
+    (html_path, html, meta). Snapshots without metadata get an empty dict.
+    """
+    for html_path in sorted(glob.glob(os.path.join(capture_dir, "**", "page-*.html"), recursive=True)):
+        with open(html_path, encoding="utf-8") as f:
+            html = f.read()
+        meta = {}
+        meta_path = html_path[:-len(".html")] + ".json"
+        if os.path.exists(meta_path):
+            with open(meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+        yield html_path, html, meta
+
+
+def replay(capture_dir, parser=None):
+    """
+    Feeds the snapshots through the same parsing and normalization path as a
+    live scrape, one page at a time.
+
+    Yields:
+    (html_path, df, typed_df, report) per snapshot with rows
+    """
+    for html_path, html, _ in load_snapshots(capture_dir):
+        data = parse_rows(html, parser)
+        if not data:
+            logging.warning(f"⚠️ No rows in {html_path}")
+            continue
+        df = rows_to_dataframe(data)
+        typed_df, report = normalize_metrics(df)
+        yield html_path, df, typed_df, report
+
+
+def check_snapshots(capture_dir, parser=None):
+    """
+    Re-parses every snapshot and compares the rows with the ones extracted
+    in the browser when it was captured.
+
+    Returns:
+    True if every snapshot with stored rows parses to the same rows
+    """
+    ok = True
+    for html_path, html, meta in load_snapshots(capture_dir):
+        if meta.get("rows") is None or meta.get("source") == "harvest":
+            continue  # harvested rows span scroll positions, the snapshot only the last one
+        rows = parse_rows(html, parser)
+        if rows == meta["rows"]:
+            logging.info(f"✅ {html_path}: {len(rows)} rows match the capture")
+        else:
+            logging.error(f"❌ {html_path}: parsed {len(rows)} rows, captured {len(meta['rows'])}")
+            ok = False
+    return ok
+
+
+def _best_of(repeat, func):
+    """Smallest wall time of `repeat` calls of func(), in seconds."""
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def bench(capture_dir, parsers=None, repeat=BENCH_REPEAT):
+    """
+    Times the hot path on the snapshots for every parser backend: parsing the
+    HTML, building the DataFrame and normalizing it. Captured JS rows are
+    benchmarked too (DataFrame and normalization only, since the extraction
+    itself ran in the browser).
+
+    Parameters:
+    capture_dir : str : Directory of the snapshots
+    parsers : list : Backend names, defaults to all installed ones
+    repeat : int : Timed passes per backend, the fastest one counts
+
+    Returns:
+    List of dicts with backend, pages, rows, parse_ms, build_ms, ms_per_page and rows_per_sec
+    """
+    snapshots = list(load_snapshots(capture_dir))
+    if not snapshots:
+        raise ValueError(f"No snapshots found in {capture_dir}")
+
+    inputs = {name: [html for _, html, _ in snapshots] for name in (parsers or PARSERS)}
+    js_rows = [meta["rows"] for _, _, meta in snapshots if meta.get("source") == "js" and meta.get("rows")]
+    if js_rows:
+        inputs[CAPTURED_JS] = None
+
+    results = []
+    for name in inputs:
+        if name == CAPTURED_JS:
+            pages = js_rows
+            parse_time = 0.0
+        else:
+            pages = [parse_rows(html, name) for html in inputs[name]]
+            parse_time = _best_of(repeat, lambda: [parse_rows(html, name) for html in inputs[name]])
+        build_time = _best_of(repeat, lambda: [normalize_metrics(rows_to_dataframe(rows)) for rows in pages if rows])
+
+        rows = sum(len(page) for page in pages)
+        total = parse_time + build_time
+        results.append({
+            "backend": name,
+            "pages": len(pages),
+            "rows": rows,
+            "parse_ms": round(parse_time * 1000, 2),
+            "build_ms": round(build_time * 1000, 2),
+            "ms_per_page": round(total * 1000 / len(pages), 2),
+            "rows_per_sec": round(rows / total) if total else None,
+        })
+    return results
+
+
+def main(argv=None, prog=None):
+    parser = argparse.ArgumentParser(prog=prog, description="Replay captured asset table snapshots without a browser.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    bench_parser = commands.add_parser("bench", help="Report rows/sec and ms/page per parser backend")
+    bench_parser.add_argument("capture_dir", nargs="?", default=CAPTURE_DIR)
+    bench_parser.add_argument("--parser", action="append", choices=list(PARSERS),
+                              help="Backend to benchmark (repeatable, default: all installed)")
+    bench_parser.add_argument("--repeat", type=int, default=BENCH_REPEAT, help="Timed passes per backend")
+    bench_parser.add_argument("--json", help="Also write the results to this JSON file")
+
+    replay_parser = commands.add_parser("replay", help="Parse and normalize the snapshots into a CSV")
+    replay_parser.add_argument("capture_dir", nargs="?", default=CAPTURE_DIR)
+    replay_parser.add_argument("--parser", choices=list(PARSERS), default=DEFAULT_PARSER)
+    replay_parser.add_argument("--out", default="replayed.csv", help="CSV file of the replayed rows")
+
+    check_parser = commands.add_parser("check", help="Compare re-parsed snapshots with the captured rows")
+    check_parser.add_argument("capture_dir", nargs="?", default=CAPTURE_DIR)
+    check_parser.add_argument("--parser", choices=list(PARSERS), default=DEFAULT_PARSER)
+    args = parser.parse_args(argv)
+
+    if args.command == "bench":
+        import pandas as pd
+
+        # Normalization warnings would drown the benchmark output
+        logging.getLogger().setLevel(logging.ERROR)
+        results = bench(args.capture_dir, args.parser, args.repeat)
+        print(pd.DataFrame(results).to_string(index=False))
+        if args.json:
+            with open(args.json, "w", encoding="utf-8") as f:
+                json.dump(results, f, indent=2)
+        return 0
+
+    if args.command == "replay":
+        if os.path.exists(args.out):
+            os.remove(args.out)
+        rows = unparsed = 0
+        for _, _, typed_df, report in replay(args.capture_dir, args.parser):
+            typed_df.to_csv(args.out, mode="a", header=not os.path.exists(args.out), index=False, encoding="utf-8")
+            rows += len(typed_df)
+            unparsed += len(report)
+        print(f"✅ Replayed {rows} rows into {args.out} ({unparsed} unparsed metric cells)")
+        return 0
+
+    return 0 if check_snapshots(args.capture_dir, args.parser) else 1
+
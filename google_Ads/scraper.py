@@ -0,0 +1,1023 @@
+import os
+import math
+import time
+import argparse
+import functools
+import logging
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
+
+from .waits import (
+    CALENDAR_XPATH, START_DATE_XPATH, END_DATE_XPATH,
+    wait_for, try_wait_for, clickable, calendar_open, element_removed, fill_date_input,
+    table_signature, wait_for_table_refresh, pagination_label,
+)
+from .scrolling import scroll_until_converged, scroll_fixed
+from .parsing import parse_rows, rows_to_dataframe
+from .harvest import harvest_table
+from .js_rows import extract_rows_js
+from .network import extract_rows_network
+from .replay import capture_page
+from .timing import TIMING_DIR, span, timed, count, enable as enable_timing, write_report
+from .session import SESSION_FILE, PASSWORD_ENV_VAR, start_session
+from .recovery import LOGGED_OUT, CRASHED, classify_error, with_recovery, run_with_restarts
+from .navigation import LOCATION_CHIP, navigate_to_assets, list_accounts, resolve_asset_type, select_asset_type
+from .filters import add_filter, apply_filters
+from .pagination import (
+    DEFAULT_PAGE_SIZE, MAX_PAGES, next_page, skip_pages, first_page, table_layout, maximize_page_size,
+    parse_pagination_label,
+)
+from .manifest import (
+    MANIFEST_DIR, IN_PROGRESS, DONE, INCOMPLETE, chunk_key, new_record, load_chunk, plan_chunks,
+    last_finished_page, mark_chunk, mark_page,
+)
+from .browser import DEBUG_ENV_VAR, create_driver
+from .planner import (
+    DEFAULT_START, DEFAULT_END, CHUNKINGS, PAGE_BUDGET, plan_date_chunks, adaptive_estimate, recorded_windows,
+)
+from .pool import run_pool
+from .normalize import normalize_metrics
+from .sinks import DATASET_DIR, OUTPUT_FORMATS, ParquetChunkWriter, read_csv_batches
+from .cache import (
+    CACHE_DIR, CONVERSION_LAG_DAYS, RECENT_TTL_HOURS, MAX_CACHE_MB, cache_key, cache_get, cache_put,
+)
+
+
+table_xpath = '//*[@id="cmExtensionPoint-id"]/base-root/div/div[2]/div[1]/view-loader/asset-multi-view/asset-stats-view/tableview/div[6]/ess-table/ess-particle-table/div[1]/div/div[2]'
+next_page_xpath = '//*[@id="cmExtensionPoint-id"]/base-root/div/div[2]/div[1]/view-loader/asset-multi-view/asset-stats-view/tableview/div[6]/div/div/div/pagination-bar/div/div[2]/div[2]/div[2]/material-button[3]/material-ripple'
+first_page_xpath = '//*[@id="cmExtensionPoint-id"]/base-root/div/div[2]/div[1]/view-loader/asset-multi-view/asset-stats-view/tableview/div[6]/div/div/div/pagination-bar/div/div[2]/div[2]/div[2]/material-button[1]/material-ripple'
+
+# Campaign filters applied once per session (field, operator, value), by preset name
+FILTER_PRESETS = {
+    "omni": [
+        ("Campaign name", "does not contain", "mohey"),
+        ("Campaign name", "contains", "omni"),
+    ],
+    "all": [],
+}
+DEFAULT_PRESET = "omni"
+
+# Column with the account id, added to every row scraped for a known account
+ACCOUNT_COLUMN = "Account ID"
+
+
+def parse_filter(text):
+    """'Campaign name|contains|omni' -> ('Campaign name', 'contains', 'omni')"""
+    parts = [part.strip() for part in text.split("|")]
+    if len(parts) != 3 or not all(parts):
+        raise argparse.ArgumentTypeError(f"expected 'field|operator|value', got '{text}'")
+    return tuple(parts)
+
+
+def _parse_asset_types(text):
+    """'Sitelink, 13' -> [(2, 'sitelink'), (13, 'location')]"""
+    try:
+        types = [resolve_asset_type(name) for name in text.split(",") if name.strip()]
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+    if not types:
+        raise argparse.ArgumentTypeError("expected at least one asset type")
+    return list(dict.fromkeys(types))
+
+
+@timed("date_range")
+def select_date_range(driver, start_date, end_date):
+    """
+    Selects a date range in the calendar widget.
+
+    Parameters:
+    driver : WebDriver instance
+    start_date : str : Start date in 'MM/DD/YYYY' format
+    end_date : str : End date in 'MM/DD/YYYY' format
+
+    Raises if the range cannot be selected, so the table is never scraped with the previous range.
+    """
+    previous_signature = table_signature(driver)
+
+    # Click Calendar and wait for the popup to open
+    clickable(driver, CALENDAR_XPATH, step="calendar").click()
+    wait_for(driver, calendar_open, step="calendar")
+    print("✅ Clicked on Calendar")
+
+    # Enter Start Date
+    fill_date_input(driver, START_DATE_XPATH, start_date)
+    print(f"✅ Start Date Set: {start_date}")
+
+    # Enter End Date
+    fill_date_input(driver, END_DATE_XPATH, end_date)
+    print(f"✅ End Date Set: {end_date}")
+
+    # Click Apply Button (if required)
+    apply_button_xpath = "//div[contains(text(), 'Apply')]"
+    try:
+        apply_button = clickable(driver, apply_button_xpath, step="apply")
+        driver.execute_script("arguments[0].click();", apply_button)
+        print("✅ Clicked on Apply Button")
+    except TimeoutException:
+        print("⚠️ No Apply button found, skipping...")
+
+    # Wait for the popup to close and the table to pick up the new range
+    try_wait_for(driver, element_removed(START_DATE_XPATH), step="calendar")
+    wait_for_table_refresh(driver, previous_signature)
+
+    print("🎉 Date range selected successfully!")
+
+
+def login_and_navigate_google_ads(driver, email, password, session_file=SESSION_FILE, account_id=None,
+                                  deep_link=True):
+    """
+    Logs in (or reuses the saved session) and opens the location assets table.
+
+    Parameters:
+    driver : WebDriver instance
+    email : str : Google account email
+    password : str : Google account password, None to read it from $GOOGLE_ADS_PASSWORD
+    session_file : str : Session cache path, None to always log in
+    account_id : str : Account to open (deep link "ocid"), None for the remembered one
+    deep_link : bool : Open the table by URL instead of clicking through the menus
+
+    Raises if the login or the navigation fails.
+    """
+    # Restore the saved session or log in, then land on Google Ads
+    start_session(driver, email, password, session_file)
+    logging.info("Navigated to Google Ads Dashboard.")
+
+    # Deep-link to Assets -> Associations, click through as a fallback
+    navigate_to_assets(driver, account_id=account_id, deep_link=deep_link)
+
+    logging.info("✅ Navigation to Google Ads assets completed successfully!")
+
+
+def iter_pages(driver, table_xpath, next_page_xpath, max_pages=MAX_PAGES, start_page=1, capture_dir=None,
+               date_chunk=None, backend="js", harvest=False):
+    """
+    Yields the table one page at a time as (page_num, df).
+
+    The next page is only requested once the consumer asks for it, so a
+    slow writer holds the browser back instead of pages piling up in memory.
+
+    Parameters:
+    driver : WebDriver instance
+    table_xpath : str : XPath of the scrollable table div
+    next_page_xpath : str : XPath of the "next page" button
+    max_pages : int : Last page number to extract; the "next" button is not clicked on it
+    start_page : int : First page to extract; earlier pages are skipped (resume)
+    capture_dir : str : Save a snapshot of every page here for offline replay, None to disable
+    date_chunk : tuple : Date range the table shows, recorded with the snapshots
+    backend : str : Row extraction backend, see extract_google_ads_data
+    harvest : bool : Collect rows while scrolling, for virtualized tables (see extract_google_ads_data)
+    """
+    if start_page > max_pages:
+        return  # every page was written before the chunk was interrupted
+    page_num = start_page
+    skip_pages(driver, next_page_xpath, start_page - 1)
+
+    while page_num <= max_pages:
+        logging.info(f"Extracting data from page {page_num}...")
+
+        # Extract data from the current page
+        with span("page", page=page_num):
+            df = extract_google_ads_data(driver, table_xpath, harvest=harvest, backend=backend,
+                                         capture_dir=capture_dir, page_num=page_num, date_chunk=date_chunk)
+
+        if df is not None:
+            yield page_num, df
+        else:
+            logging.warning(f"⚠️ No data extracted from page {page_num}")
+
+        if page_num == max_pages:
+            break
+
+        # Move to the next page; a failed click only ends the table on its last page
+        try:
+            next_page(driver, next_page_xpath)
+        except Exception:
+            if not _on_last_page(driver, max_pages):
+                raise
+            logging.info("No more Rows")
+            break
+
+        page_num += 1
+
+
+def _on_last_page(driver, max_pages):
+    """
+    True if the table shows its last rows. Without a known page count and
+    a readable label, a "next" button that does not work is taken as the end.
+    """
+    parsed = parse_pagination_label(pagination_label(driver))
+    if parsed:
+        return parsed[1] >= parsed[2]
+    return max_pages == MAX_PAGES
+
+
+def extract_multiple_pages(driver, table_xpath, next_page_xpath, max_pages=MAX_PAGES, start_page=1, on_page=None):
+    """
+    Extracts the table page by page, following the pagination "next" button.
+    Keeps every page in memory; use iter_pages to stream instead.
+
+    Parameters:
+    driver : WebDriver instance
+    table_xpath : str : XPath of the scrollable table div
+    next_page_xpath : str : XPath of the "next page" button
+    max_pages : int : Last page number to extract
+    start_page : int : First page to extract; earlier pages are skipped (resume)
+    on_page : callable : on_page(page_num, df), called after each extracted page
+
+    Returns:
+    List of per-page DataFrames
+    """
+    dataframes = []
+    for page_num, df in iter_pages(driver, table_xpath, next_page_xpath, max_pages, start_page):
+        dataframes.append(df)
+        if on_page:
+            on_page(page_num, df)
+    return dataframes
+
+
+def extract_google_ads_data(driver, table_xpath, max_scroll_attempts=15, wait_time=1, scroll_mode="adaptive",
+                            harvest=False, backend="js", capture_dir=None, page_num=None, date_chunk=None):
+    """
+    Scrolls the asset table into full view and parses it into a DataFrame.
+
+    Parameters:
+    driver : WebDriver instance
+    table_xpath : str : XPath of the scrollable table div
+    max_scroll_attempts : int : PAGE_DOWN presses in "fixed" scroll mode
+    wait_time : float : Pause between presses in "fixed" scroll mode
+    scroll_mode : str : "adaptive" (stop once the table converges) or "fixed"
+    harvest : bool : Collect new rows after every scroll step instead of parsing
+                     one snapshot at the end (for virtualized tables)
+    backend : str : "js" (extract rows inside the page, falls back to "html" on
+                    failure), "html" (outerHTML parsed with BeautifulSoup) or
+                    "network" (decode the data response the table was rendered
+                    from, falls back to "js" when it does not match the table).
+                    "network" is for the mock benchmark only: the decoder knows
+                    the mock's /api/rows responses, not the live Ads UI's, so
+                    the scrape command does not offer it.
+    capture_dir : str : Save a snapshot of the table here for offline replay, None to disable
+                        (pages read from the network have no rendered table to snapshot)
+    page_num, date_chunk : Page and date range recorded with the snapshot
+
+    The number of scroll steps used is stored in `df.attrs["scroll_steps"]`.
+    Returns None if the page has no rows; errors are raised, not mistaken for an empty page.
+    """
+    # Wait for the table to be present
+    WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.CLASS_NAME, "ess-table-canvas")))
+    # time.sleep(2)
+
+    if backend == "network":
+        # No scrolling or parsing: the rows come from the response that filled the table
+        try:
+            with span("extract_network"):
+                data = extract_rows_network(driver, page_num or 1)
+            count("network_pages")
+            return _to_dataframe(data, 0)
+        except Exception as e:
+            count("network_fallbacks")
+            logging.warning(f"⚠️ Network extraction failed, falling back to the DOM: {e}")
+            backend = "js"
+
+    table_div = driver.find_element(By.XPATH, table_xpath)
+
+    scroll_started = time.monotonic()
+    if harvest:
+        # Scroll and collect rows as they render
+        with span("scroll_harvest"):
+            data, scroll_steps = harvest_table(driver, table_div, scroll_mode, max_scroll_attempts, wait_time,
+                                               backend)
+    else:
+        # Scroll down until all data is loaded
+        with span("scroll"):
+            if scroll_mode == "fixed":
+                scroll_steps = scroll_fixed(table_div, max_scroll_attempts, wait_time)
+            else:
+                scroll_steps = scroll_until_converged(driver, table_div)
+
+        data = None
+        source = "html"
+        if backend == "js":
+            try:
+                with span("extract_js"):
+                    data = extract_rows_js(driver, table_div)
+                source = "js"
+            except Exception as e:
+                logging.warning(f"⚠️ In-page row extraction failed, falling back to HTML parsing: {e}")
+        if data is None:
+            # Extract the table's HTML content
+            with span("fetch_html"):
+                full_html = table_div.get_attribute("outerHTML")
+            with span("parse"):
+                data = parse_rows(full_html)
+    logging.info(f"Scrolled table in {scroll_steps} steps ({time.monotonic() - scroll_started:.2f}s)")
+
+    if capture_dir:
+        try:
+            capture_page(capture_dir, driver, table_div, page_num, date_chunk, data,
+                         "harvest" if harvest else source, scroll_steps)
+        except Exception as e:
+            logging.warning(f"⚠️ Could not capture the table snapshot: {e}")
+
+    return _to_dataframe(data, scroll_steps)
+
+
+def _to_dataframe(data, scroll_steps):
+    """DataFrame of extracted rows, or None if there are no data rows."""
+    if not data:
+        print("❌ No rows found. Check the HTML structure.")
+        return None
+
+    # Convert to Pandas DataFrame
+    with span("dataframe"):
+        df = rows_to_dataframe(data)
+    if df.empty:
+        print("❌ Only a header row found.")
+        return None
+    df.attrs["scroll_steps"] = scroll_steps
+    return df
+
+
+def probe_rows(driver, date_chunk):
+    """
+    Selects a date range and reads its row total and page size from the
+    pagination label.
+
+    Returns:
+    (total_rows, page_size), or None if the label cannot be read. A failed
+    probe only costs the estimate: the window is planned as of unknown volume.
+    """
+    with span("probe", chunk=chunk_key(date_chunk)):
+        try:
+            select_date_range(driver, date_chunk[0], date_chunk[1])
+            layout = table_layout(driver)
+        except Exception as e:
+            logging.warning(f"⚠️ Could not probe {date_chunk}: {e}")
+            layout = None
+    count("probes")
+    if layout:
+        logging.info(f"Probed {date_chunk}: {layout[0]} rows, {layout[1]} per page")
+        return layout[0], layout[1]
+    return None
+
+
+def setup_session(driver, session_file=SESSION_FILE, account_id=None, deep_link=True, filters=(), email=""):
+    """
+    Logs in (or reuses the saved session), opens the assets table, applies
+    the campaign filters and switches to the largest page size. Runs once per
+    browser session. The password of `email` comes from $GOOGLE_ADS_PASSWORD.
+    """
+    login_and_navigate_google_ads(driver, email, None, session_file=session_file, account_id=account_id,
+                                  deep_link=deep_link)
+    prepare_table(driver, filters)
+
+
+def prepare_table(driver, filters=()):
+    """Applies the campaign filters to the open assets table and shows the most rows per page."""
+    if filters:
+        apply_filters(driver, filters)
+
+    maximize_page_size(driver)
+
+
+def open_account(driver, account_id, filters=(), deep_link=True):
+    """Switches a signed-in session to the assets table of `account_id`, filtered and paged like setup_session."""
+    navigate_to_assets(driver, account_id=account_id, deep_link=deep_link)
+    prepare_table(driver, filters)
+
+
+def chunk_csv_filename(date_chunk, account_id=None, asset_type=None):
+    """
+    CSV file of one date range, e.g. '01-06-2025_01-12-2025.csv', prefixed
+    with the account and suffixed with the asset type when they are given:
+    '123-456-7890_01-06-2025_01-12-2025_sitelink.csv'.
+    """
+    name = chunk_key(date_chunk)
+    if account_id:
+        name = f"{account_id}_{name}"
+    if asset_type:
+        name = f"{name}_{asset_type}"
+    return f"{name}.csv"
+
+
+def _truncate_csv(csv_filename, rows):
+    """Drops rows written after the last page the manifest recorded (crash between write and record)."""
+    if not os.path.exists(csv_filename):
+        return
+    # Copied batch by batch so a large journal is never loaded whole
+    kept = 0
+    tmp_path = f"{csv_filename}.{os.getpid()}.tmp"
+    for batch in read_csv_batches(csv_filename):
+        batch = batch.head(rows - kept)
+        batch.to_csv(tmp_path, mode="a", header=not os.path.exists(tmp_path), index=False, encoding="utf-8")
+        kept += len(batch)
+        if kept >= rows:
+            break
+    os.replace(tmp_path, csv_filename)
+
+
+def chunk_cache_key(date_chunk, cache_settings):
+    """Result cache key of a chunk scraped with the run's asset-type chip and filters."""
+    return cache_key(cache_settings["account_id"], cache_settings.get("chip", LOCATION_CHIP),
+                     cache_settings["filters"], date_chunk)
+
+
+def write_pages(pages, date_chunk, record, manifest_dir=MANIFEST_DIR, output_settings=None):
+    """
+    Writes pages to the chunk outputs as they arrive, one page in memory at a
+    time. Each page is appended to the chunk CSV (the page journal) and
+    recorded in the manifest before the next one is pulled from `pages`.
+    With Parquet output every page is also normalized and appended as a row
+    group; the part file is only published once the chunk is complete.
+
+    Parameters:
+    pages : iterable : (page_num, df) pairs, e.g. from iter_pages
+    date_chunk : tuple : (start_date, end_date) in 'MM/DD/YYYY' format
+    record : dict : Manifest record of the chunk
+    manifest_dir : str : Directory of the run manifest
+    output_settings : dict : Output formats and Parquet dataset settings, None for CSV only
+
+    Returns:
+    Number of rows in the chunk
+    """
+    csv_filename = record["output"]
+    formats = output_settings["formats"] if output_settings else ["csv"]
+    parquet = None
+    if "parquet" in formats:
+        parquet = ParquetChunkWriter(output_settings["dataset_dir"], date_chunk, output_settings["account_id"],
+                                     output_settings.get("asset_type"))
+        record["unparsed_cells"] = 0
+
+    def to_parquet(df):
+        typed_df, unparsed = normalize_metrics(df)
+        record["unparsed_cells"] += len(unparsed)
+        parquet.write(typed_df)
+
+    try:
+        if parquet and os.path.exists(csv_filename):
+            # Pages journaled before a resume go into the part file first
+            for batch in read_csv_batches(csv_filename):
+                to_parquet(batch)
+
+        for page_num, df in pages:
+            with span("write", page=page_num):
+                df.to_csv(csv_filename, mode="a", header=not os.path.exists(csv_filename), index=False,
+                          encoding="utf-8")
+                if parquet:
+                    to_parquet(df)
+                mark_page(manifest_dir, record, page_num, len(df))
+
+        if parquet and record["rows"]:
+            with span("write_commit"):
+                record["parquet"] = parquet.commit()
+    finally:
+        if parquet:
+            parquet.abort()
+
+    return record["rows"]
+
+
+def finish_outputs(record, output_settings=None):
+    """
+    Returns the main output path of a written chunk, or None if it has no
+    rows. The chunk CSV is removed here when it only served as the journal.
+    """
+    formats = output_settings["formats"] if output_settings else ["csv"]
+    if not record["rows"]:
+        return None
+    if "csv" not in formats:
+        if os.path.exists(record["output"]):
+            os.remove(record["output"])
+        return record["parquet"]
+    return record["output"]
+
+
+def load_cached_chunk(date_chunk, manifest_dir=MANIFEST_DIR, cache_settings=None, output_settings=None):
+    """
+    Writes a chunk's outputs from the result cache and marks it done.
+    Returns False on a cache miss.
+    """
+    cached_csv = cache_get(cache_settings["dir"], chunk_cache_key(date_chunk, cache_settings),
+                           cache_settings["ttl_hours"])
+    if cached_csv is None:
+        return False
+
+    record = new_record(date_chunk, _chunk_output(date_chunk, output_settings))
+    if os.path.exists(record["output"]):
+        os.remove(record["output"])
+    # Cached batches take the place of pages, so the outputs are written exactly as when scraping
+    with span("cache_replay", chunk=chunk_key(date_chunk)):
+        write_pages(enumerate(read_csv_batches(cached_csv), start=1), date_chunk, record, manifest_dir,
+                    output_settings)
+    finish_outputs(record, output_settings)
+    record["cached"] = True
+    mark_chunk(manifest_dir, record, DONE)
+    print(f"✅ {date_chunk} served from cache ({record['rows']} rows)")
+    return True
+
+
+def _chunk_output(date_chunk, output_settings=None):
+    """CSV file of a chunk: the fixed --csv-file, or named for the account and asset type of `output_settings`."""
+    output_settings = output_settings or {}
+    if output_settings.get("csv_file"):
+        return output_settings["csv_file"]
+    return chunk_csv_filename(date_chunk, output_settings.get("account_id"), output_settings.get("asset_type"))
+
+
+def scrape_chunk(driver, date_chunk, manifest_dir=MANIFEST_DIR, cache_settings=None, output_settings=None,
+                 select_range=True):
+    """
+    Scrapes every page of one date range into its own CSV, streaming each
+    page to disk and to the run manifest as soon as it is extracted.
+    A chunk that was interrupted continues after its last finished page; one
+    that ended short of the label's row total is recorded as incomplete and
+    scraped again from the first page.
+
+    Parameters:
+    driver : WebDriver instance with a prepared session
+    date_chunk : tuple : (start_date, end_date) in 'MM/DD/YYYY' format
+    manifest_dir : str : Directory of the run manifest
+    cache_settings : dict : Result cache settings, None to disable the cache
+    output_settings : dict : Output formats and Parquet dataset settings, None for CSV only
+    select_range : bool : Select the date range first; False when the table already shows it
+
+    Returns:
+    The main output path (CSV, or Parquet part without CSV), or None if nothing was extracted
+    """
+    account_id = output_settings.get("account_id") if output_settings else None
+    with span("chunk", chunk=chunk_key(date_chunk)):
+        record = load_chunk(manifest_dir, date_chunk) or new_record(date_chunk, _chunk_output(date_chunk,
+                                                                                              output_settings))
+        csv_filename = record["output"]
+        if record["status"] == DONE:
+            print(f"⏭️ {date_chunk} already done, skipping.")
+            return (record.get("parquet") or csv_filename) if record["rows"] else None
+        if record["status"] == INCOMPLETE:
+            # Its pages are all recorded, but they were short of rows: start over
+            logging.info(f"{date_chunk} was incomplete, scraping it again from the first page")
+            record = new_record(date_chunk, csv_filename)
+
+        start_page = last_finished_page(record) + 1
+        if start_page == 1:
+            if os.path.exists(csv_filename):
+                os.remove(csv_filename)  # leftovers of an unrecorded attempt
+        else:
+            _truncate_csv(csv_filename, record["rows"])
+            logging.info(f"Resuming {date_chunk} at page {start_page}")
+        mark_chunk(manifest_dir, record, IN_PROGRESS)
+
+        print(date_chunk)
+        if select_range:
+            select_date_range(driver, date_chunk[0], date_chunk[1])
+
+        # Page exactly as often as the label's row total requires
+        layout = table_layout(driver)
+        if layout:
+            total_rows, page_size, page_count = layout
+            record.update(expected_rows=total_rows, page_size=page_size, page_count=page_count)
+            logging.info(f"{total_rows} rows on {page_count} pages of {page_size}")
+        else:
+            page_count = MAX_PAGES
+            logging.warning("⚠️ Could not read the row total, paging until the last page")
+
+        capture_dir = output_settings.get("capture_dir") if output_settings else None
+        backend = output_settings.get("backend", "js") if output_settings else "js"
+        harvest = output_settings.get("harvest", False) if output_settings else False
+        paging = start_page <= page_count
+        if paging:
+            pages = iter_pages(driver, table_xpath, next_page_xpath, max_pages=page_count, start_page=start_page,
+                               capture_dir=capture_dir and os.path.join(capture_dir, chunk_key(date_chunk)),
+                               date_chunk=date_chunk, backend=backend, harvest=harvest)
+        else:
+            # Interrupted after its last page was recorded: only the outputs are left to finish
+            logging.info(f"All {page_count} pages of {date_chunk} were written before, finishing the chunk")
+            pages = iter(())
+        if account_id:
+            pages = ((page_num, df.assign(**{ACCOUNT_COLUMN: account_id})) for page_num, df in pages)
+        rows = write_pages(pages, date_chunk, record, manifest_dir, output_settings)
+        complete = not layout or rows == total_rows
+        if layout:
+            count("pages", page_count)
+            count("pages_saved", math.ceil(total_rows / DEFAULT_PAGE_SIZE) - page_count)
+            if not complete:
+                logging.warning(f"⚠️ {date_chunk}: got {rows} of {total_rows} rows, recording the chunk as "
+                                f"incomplete (not cached, scraped again with --resume)")
+        if rows:
+            if cache_settings and complete:
+                cache_put(cache_settings["dir"], chunk_cache_key(date_chunk, cache_settings), date_chunk,
+                          csv_filename, record["rows"], cache_settings["lag_days"], cache_settings["max_mb"])
+            output = finish_outputs(record, output_settings)
+            print(f"✅ Data saved to {output}")
+        else:
+            output = None
+            print("⚠️ No data extracted, skipping CSV saving.")
+        mark_chunk(manifest_dir, record, DONE if complete else INCOMPLETE)
+
+        if paging and last_finished_page(record) > 1:
+            first_page(driver, first_page_xpath)
+
+        return output
+
+
+def rebuild_session(driver, error_class, session):
+    """
+    Brings a session back to the filtered assets table after an error:
+    signs in again if it was logged out, then reopens the account's table,
+    reapplies the filters and the page size. Date range and asset type are
+    selected again by the step that is retried.
+
+    Parameters:
+    driver : WebDriver instance
+    error_class : str : recovery error class of the failure
+    session : dict : account_id, filters, deep_link, email and session_file of the run
+    """
+    if error_class == LOGGED_OUT:
+        start_session(driver, session["email"], session_file=session["session_file"])
+    open_account(driver, session["account_id"], session["filters"], session["deep_link"])
+
+
+def setup_with_recovery(driver, setup, session):
+    """
+    Runs `setup(driver)` (e.g. a partial of setup_session) and retries it
+    after recoverable errors, rebuilding the session in between like the
+    scraping steps do. A module-level function, so that a partial of it can
+    prepare process pool workers.
+    """
+    with_recovery(driver, functools.partial(setup, driver), functools.partial(rebuild_session, driver, session=session),
+                  what="session setup")
+
+
+def scrape_chunk_types(driver, date_chunk, types, session=None):
+    """
+    Scrapes one date range for several asset types in a prepared session.
+    The date range is selected once; each type then only switches the
+    asset-type chip, keeping the date range and filters, and gets its own
+    manifest, cache key and outputs. Types whose chunk is done are skipped.
+
+    A type that fails with a recoverable error (stale element, timeout,
+    logged out) is retried with backoff after rebuild_session; the retry
+    selects the range again and continues after the last page the manifest
+    recorded. Other errors are raised.
+
+    Parameters:
+    driver : WebDriver instance with a prepared session
+    date_chunk : tuple : (start_date, end_date) in 'MM/DD/YYYY' format
+    types : list : Per-type dicts with chip, manifest_dir, cache_settings and output_settings
+    session : dict : Settings for rebuild_session, None to not recover
+
+    Returns:
+    List of the outputs of the scraped types
+    """
+    pending = [asset_type for asset_type in types
+               if (load_chunk(asset_type["manifest_dir"], date_chunk) or {}).get("status") != DONE]
+    range_selected = [False]
+
+    def scrape_type(asset_type):
+        if not range_selected[0]:
+            select_date_range(driver, date_chunk[0], date_chunk[1])
+            range_selected[0] = True
+        select_asset_type(driver, asset_type["chip"])
+        return scrape_chunk(driver, date_chunk, asset_type["manifest_dir"], asset_type["cache_settings"],
+                            asset_type["output_settings"], select_range=False)
+
+    def recover(error_class):
+        range_selected[0] = False
+        rebuild_session(driver, error_class, session)
+
+    outputs = []
+    for asset_type in pending:
+        with span("asset_type", chip=asset_type["chip"]):
+            if session is None:
+                outputs.append(scrape_type(asset_type))
+            else:
+                outputs.append(with_recovery(driver, functools.partial(scrape_type, asset_type), recover,
+                                             what=f"{date_chunk} chip {asset_type['chip']}"))
+    return outputs
+
+
+def scrape_account(driver, job):
+    """
+    Opens one account in a signed-in session and scrapes its pending chunks.
+    Steps that fail with a recoverable error are retried in place; a crashed
+    browser is raised at once so that the caller can replace it.
+
+    Parameters:
+    driver : WebDriver instance with a started session
+    job : dict : account_id, chunks, asset types and session settings of the account, as planned by _plan_account
+
+    Returns:
+    List of the chunk outputs. Raises RuntimeError naming the failed chunks after trying all of them.
+    """
+    session = job["session"]
+    with span("account", account=job["account_id"]):
+        with_recovery(driver, functools.partial(open_account, driver, job["account_id"], session["filters"],
+                                                session["deep_link"]),
+                      functools.partial(rebuild_session, driver, session=session), what=f"open {job['account_id']}")
+        outputs = []
+        failed = []
+        for date_chunk in job["chunks"]:
+            try:
+                outputs.extend(scrape_chunk_types(driver, date_chunk, job["types"], session))
+            except Exception as e:
+                if classify_error(driver, e) == CRASHED:
+                    raise
+                logging.error(f"❌ {job['account_id']} {date_chunk}: {e}")
+                failed.append(date_chunk)
+        if failed:
+            raise RuntimeError(f"{len(failed)} of {len(job['chunks'])} chunks failed: {failed}")
+        return outputs
+
+
+def _plan_account(args, account_id, date_chunks, filters, formats, probe=None, page_size=None):
+    """
+    Settings of one account of the run and its chunks that are neither
+    finished nor served from the cache for every asset type. Accounts of a
+    fan-out run each get their own manifest and capture subdirectory, and
+    so does each asset type of a --asset-types run.
+
+    With `date_chunks` None the chunks are planned adaptively from the
+    account's manifest history, windows without history measured by `probe`,
+    and the row budget sized by `page_size` when the history has none.
+    A resumed run keeps the windows of its manifest if they cover the range.
+    """
+    fan_out = bool(args.accounts)
+    manifest_dir = os.path.join(args.manifest_dir, account_id) if fan_out else args.manifest_dir
+    capture_dir = os.path.join(args.capture_dir, account_id) if fan_out and args.capture_dir else args.capture_dir
+    asset_types = [(chip, slug, os.path.join(manifest_dir, slug) if slug else manifest_dir)
+                   for chip, slug in args.asset_types or [(LOCATION_CHIP, None)]]
+
+    if date_chunks is None:
+        type_dirs = [type_manifest_dir for _, _, type_manifest_dir in asset_types]
+        date_chunks = args.resume and recorded_windows(type_dirs[0], args.start, args.end)
+        if date_chunks:
+            logging.info(f"Resuming the {len(date_chunks)} adaptive chunks of the manifest")
+        else:
+            estimate, row_budget = adaptive_estimate(type_dirs, args.page_budget, probe, page_size)
+            date_chunks = plan_date_chunks(args.start, args.end, "adaptive", estimate, row_budget)
+            logging.info(f"Planned {len(date_chunks)} adaptive chunks of up to {row_budget} rows")
+
+    types = []
+    pending = set()
+    for chip, slug, type_manifest_dir in asset_types:
+        output_settings = {"formats": formats, "dataset_dir": args.dataset_dir, "account_id": account_id,
+                           "asset_type": slug, "backend": args.backend, "harvest": args.harvest,
+                           "csv_file": args.csv_file,
+                           "capture_dir": os.path.join(capture_dir, slug) if capture_dir and slug else capture_dir}
+        cache_settings = None
+        if args.cache_dir:
+            cache_settings = {
+                "dir": args.cache_dir,
+                "account_id": account_id,
+                "chip": chip,
+                "filters": filters,
+                "ttl_hours": args.cache_ttl_hours,
+                "lag_days": args.conversion_lag_days,
+                "max_mb": args.cache_max_mb,
+            }
+        records = plan_chunks(type_manifest_dir, date_chunks,
+                              functools.partial(_chunk_output, output_settings=output_settings),
+                              resume=args.resume)
+        # A chunk needs the browser while any of its asset types is pending
+        pending.update(chunk_key(date_chunk) for date_chunk in date_chunks
+                       if records[chunk_key(date_chunk)]["status"] != DONE
+                       and not (cache_settings and load_cached_chunk(date_chunk, type_manifest_dir, cache_settings,
+                                                                 output_settings)))
+        types.append({"chip": chip, "manifest_dir": type_manifest_dir, "cache_settings": cache_settings,
+                      "output_settings": output_settings})
+
+    chunks = [date_chunk for date_chunk in date_chunks if chunk_key(date_chunk) in pending]
+    session = {"account_id": account_id, "filters": filters, "deep_link": not args.no_deep_link,
+               "email": args.email, "session_file": args.session_file or None}
+    return {"account_id": account_id, "chunks": chunks, "types": types, "session": session}
+
+
+def _run_accounts(args, date_chunks, filters, formats, driver_factory):
+    """
+    Scrapes the same chunks and filters for several accounts (--accounts).
+    The run logs in once; pool workers restore that saved session and take
+    whole accounts from the queue.
+    """
+    session_file = args.session_file or None
+    driver = None
+    try:
+        if args.accounts == "all":
+            driver = driver_factory()
+            start_session(driver, args.email, session_file=session_file)
+            account_ids = [account["id"] for account in list_accounts(driver)]
+        else:
+            account_ids = [account_id.strip() for account_id in args.accounts.split(",") if account_id.strip()]
+
+        jobs = [_plan_account(args, account_id, date_chunks, filters, formats) for account_id in account_ids]
+        jobs = [job for job in jobs if job["chunks"]]
+        logging.info(f"{len(jobs)} of {len(account_ids)} accounts have chunks to scrape")
+        if not jobs:
+            return 0
+
+        prepare_session = functools.partial(start_session, email=args.email, session_file=session_file)
+        if driver is None:
+            # Log in here, once: the workers then restore the saved session instead
+            # of each logging in (without a session file every session logs in)
+            driver = driver_factory()
+            prepare_session(driver)
+        if args.workers > 1:
+            driver.quit()  # its session is saved, the workers restore it
+            driver = None
+            results = run_pool(jobs, prepare_session, scrape_account, workers=args.workers, mode=args.pool_mode,
+                               log_dir=args.log_dir, driver_factory=driver_factory)
+            failed = [(job, error) for job, _, error in results if error]
+        else:
+            failed = []
+            for job in jobs:
+                # A crashed browser is replaced and the account resumed from its manifest
+                driver, _, error = run_with_restarts(driver, job, scrape_account, driver_factory, prepare_session)
+                if error:
+                    failed.append((job, error))
+                if driver is None:
+                    failed.extend((other, "not scraped") for other in jobs[jobs.index(job) + 1:])
+                    break
+
+        for job, error in failed:
+            logging.error(f"❌ Account {job['account_id']}: {error}")
+        return 1 if failed else 0
+
+    finally:
+        if driver is not None:
+            driver.quit()
+            logging.info("Browser closed.")
+
+
+def main(argv=None, prog=None):
+    parser = argparse.ArgumentParser(prog=prog, description="Scrape Google Ads asset stats into one CSV per week.")
+    parser.add_argument("--start", default=DEFAULT_START, help="Start date in MM/DD/YYYY format")
+    parser.add_argument("--end", default=DEFAULT_END, help="End date in MM/DD/YYYY format")
+    parser.add_argument("--chunking", choices=CHUNKINGS, default="weekly",
+                        help="Scrape the range week by week, as a single date selection, or in daily to monthly "
+                             "windows sized by the row counts of earlier runs (adaptive)")
+    parser.add_argument("--page-budget", type=int, default=PAGE_BUDGET,
+                        help="adaptive: pages one chunk may take; windows are split or merged to fit it")
+    parser.add_argument("--probe", action="store_true",
+                        help="adaptive: read the row total of windows the manifest has no counts for "
+                             "(single account only)")
+    parser.add_argument("--preset", choices=list(FILTER_PRESETS), default=DEFAULT_PRESET,
+                        help="Named set of campaign filters applied once per session")
+    parser.add_argument("--filter", action="append", type=parse_filter, metavar="FIELD|OPERATOR|VALUE",
+                        help="Filter to apply instead of the preset (repeatable)")
+    parser.add_argument("--workers", type=int, default=1, help="Number of parallel browser sessions")
+    parser.add_argument("--pool-mode", choices=["thread", "process"], default="thread",
+                        help="Run each browser session in a thread or in its own process")
+    parser.add_argument("--log-dir", default="logs", help="Directory for per-worker log files")
+    parser.add_argument("--chromedriver",
+                        help="chromedriver binary to use (default: $CHROMEDRIVER_PATH, the cached or the installed one)")
+    parser.add_argument("--debug-browser", action="store_true",
+                        help="Visible Chrome that loads every resource instead of the headless production profile")
+    parser.add_argument("--email", default="",
+                        help=f"Google account to sign in with when there is no valid saved session; "
+                             f"its password is read from ${PASSWORD_ENV_VAR}")
+    parser.add_argument("--session-file", default=SESSION_FILE,
+                        help="Saved login session shared by runs and workers (empty to always log in)")
+    parser.add_argument("--resume", action="store_true",
+                        help="Skip chunks finished by an earlier run and continue partial ones at their last page")
+    parser.add_argument("--manifest-dir", default=MANIFEST_DIR, help="Directory of the run manifest")
+    parser.add_argument("--account-id", help="Google Ads account id to open (default: the remembered one)")
+    parser.add_argument("--accounts",
+                        help="Scrape several accounts with one login: 'all' from the account list, "
+                             "or comma-separated account ids")
+    parser.add_argument("--asset-types", type=_parse_asset_types, metavar="TYPE,...",
+                        help="Asset-type chips to scrape in one session, by name or chip position "
+                             "(e.g. 'Sitelink,Callout,Location'); each type gets its own outputs and columns")
+    parser.add_argument("--no-deep-link", action="store_true",
+                        help="Always click through the navigation instead of opening the table by URL")
+    parser.add_argument("--cache-dir", default=CACHE_DIR, help="Result cache directory (empty to disable)")
+    parser.add_argument("--cache-ttl-hours", type=float, default=RECENT_TTL_HOURS,
+                        help="Lifetime of cached results for periods that can still change")
+    parser.add_argument("--conversion-lag-days", type=int, default=CONVERSION_LAG_DAYS,
+                        help="Periods that ended more than this many days ago are never re-fetched")
+    parser.add_argument("--cache-max-mb", type=float, default=MAX_CACHE_MB, help="Result cache size budget")
+    parser.add_argument("--output", default="csv",
+                        help=f"Comma-separated output formats: {', '.join(OUTPUT_FORMATS)}")
+    parser.add_argument("--csv-file",
+                        help="Write the CSV of a single-chunk run (--chunking none) to this file instead of "
+                             "one named after its date range")
+    parser.add_argument("--dataset-dir", default=DATASET_DIR, help="Root of the partitioned Parquet dataset")
+    parser.add_argument("--timing-dir", default=TIMING_DIR,
+                        help="Where span timings, the JSON summary and the Prometheus file go (empty to disable)")
+    parser.add_argument("--harvest", action="store_true",
+                        help="Collect rows after every scroll step, for tables that drop rows scrolled out of view")
+    parser.add_argument("--backend", choices=["js", "html"], default="js",
+                        help="How rows are read: in the page (js) or from the table HTML (html)")
+    parser.add_argument("--capture-dir",
+                        help="Save a snapshot of every scraped page here for offline replay and benchmarks")
+    args = parser.parse_args(argv)
+
+    formats = [f.strip() for f in args.output.split(",") if f.strip()]
+    unknown = set(formats) - set(OUTPUT_FORMATS)
+    if not formats or unknown:
+        parser.error(f"--output must list formats out of {', '.join(OUTPUT_FORMATS)}")
+    if args.csv_file and (args.chunking != "none" or args.accounts or len(args.asset_types or ()) > 1):
+        parser.error("--csv-file needs --chunking none, a single account and a single asset type")
+    if args.accounts and args.account_id:
+        parser.error("--accounts and --account-id are mutually exclusive")
+    if args.probe and (args.chunking != "adaptive" or args.accounts):
+        parser.error("--probe needs --chunking adaptive and a single account")
+    filters = args.filter if args.filter is not None else FILTER_PRESETS[args.preset]
+
+    if args.debug_browser:
+        os.environ[DEBUG_ENV_VAR] = "1"  # inherited by pool worker processes
+    if args.timing_dir:
+        enable_timing(args.timing_dir)
+
+    try:
+        # Adaptive chunks are planned per account, from its own manifest history
+        date_chunks = None if args.chunking == "adaptive" else plan_date_chunks(args.start, args.end, args.chunking)
+        driver_factory = functools.partial(create_driver, driver_path=args.chromedriver)
+        if args.accounts:
+            return _run_accounts(args, date_chunks, filters, formats, driver_factory)
+
+        session = {"account_id": args.account_id, "filters": filters, "deep_link": not args.no_deep_link,
+                   "email": args.email, "session_file": args.session_file or None}
+        prepare_session = functools.partial(
+            setup_with_recovery, session=session,
+            setup=functools.partial(setup_session, session_file=session["session_file"], account_id=args.account_id,
+                                    deep_link=session["deep_link"], filters=filters, email=session["email"]))
+        driver = None
+        probe = page_size = None
+        if args.probe:
+            # Windows without history are measured in a session that then scrapes them
+            driver = driver_factory()
+            try:
+                prepare_session(driver)
+            except Exception:
+                driver.quit()
+                raise
+            probe = functools.partial(probe_rows, driver)
+            # The page size the row budget is counted in, as the table shows it now
+            probed = probe((args.start, args.end))
+            page_size = probed[1] if probed else None
+
+        # Only chunks that are neither finished nor cached need a browser
+        job = _plan_account(args, args.account_id, date_chunks, filters, formats, probe, page_size)
+        pending = job["chunks"]
+        signed_in = driver is not None  # the probe session has saved its login
+        if not pending or args.workers > 1:
+            if driver is not None:
+                driver.quit()
+                driver = None
+        if not pending:
+            logging.info("✅ All chunks are finished or cached, no browser session needed.")
+            return 0
+
+        scrape = functools.partial(scrape_chunk_types, types=job["types"], session=job["session"])
+
+        if args.workers > 1:
+            if not signed_in and session["session_file"]:
+                # Log in here, once: the workers then restore the saved session instead of each logging in
+                driver = driver_factory()
+                try:
+                    start_session(driver, session["email"], session_file=session["session_file"])
+                finally:
+                    driver.quit()
+                    driver = None
+            results = run_pool(pending, prepare_session, scrape, workers=args.workers, mode=args.pool_mode,
+                               log_dir=args.log_dir, driver_factory=driver_factory)
+            failed = 0
+            for date_chunk, outputs, error in results:
+                if error:
+                    failed += 1
+                    logging.error(f"❌ {date_chunk}: {error}")
+            return 1 if failed else 0
+
+        try:
+            if driver is None:
+                driver = driver_factory()
+                prepare_session(driver)
+            failed = 0
+            for index, date_chunk in enumerate(pending):
+                # A crashed browser is replaced and the chunk resumed at its failing page
+                driver, _, error = run_with_restarts(driver, date_chunk, scrape, driver_factory, prepare_session)
+                if error:
+                    failed += 1
+                    logging.error(f"❌ {date_chunk}: {error}")
+                if driver is None:
+                    # No browser to go on with: the remaining chunks stay for --resume
+                    failed += len(pending) - index - 1
+                    logging.error("❌ No browser left, the remaining chunks were not scraped")
+                    break
+            if failed:
+                logging.error(f"❌ {failed} of {len(pending)} chunks failed")
+                return 1
+
+        except Exception as e:
+            logging.error(f"Error occurred: {e}")
+            return 1
+
+        finally:
+            # Close browser
+            if driver is not None:
+                driver.quit()
+                logging.info("Browser closed.")
+
+    finally:
+        if args.timing_dir:
+            write_report(args.timing_dir)
+    return 0
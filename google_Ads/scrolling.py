@@ -0,0 +1,108 @@
+import time
+import logging
+from selenium.webdriver.common.keys import Keys
+
+from . import waits
+
+
+# Adaptive scrolling defaults (seconds)
+SETTLE_TIME = 0.15       # how long to watch for new rows after a scroll step
+MAX_SETTLE_TIME = 1.6    # longest back-off while the table looks stuck
+STABLE_CHECKS = 2        # unchanged steps at the bottom before we call it done
+MAX_SCROLL_STEPS = 500   # safety net only, not a data budget
+
+_SCROLL_STATE_JS = """
+var table = arguments[0];
+var rows = table.querySelectorAll("div[role='row']").length;
+var el = table;
+while (el && el !== document.body && el.scrollHeight <= el.clientHeight) { el = el.parentElement; }
+if (!el || el === document.body) { el = document.scrollingElement || document.documentElement; }
+var top = Math.round(el.scrollTop);
+var atBottom = el.scrollTop + el.clientHeight >= el.scrollHeight - 1;
+return [rows, top, atBottom];
+"""
+
+
+def scroll_state(driver, table_div):
+    """
+    Returns (row_count, scroll_top, at_bottom) for the table's scroll container
+    in a single round trip.
+    """
+    rows, top, at_bottom = driver.execute_script(_SCROLL_STATE_JS, table_div)
+    return rows, top, bool(at_bottom)
+
+
+def _wait_for_change(driver, table_div, state, settle_time):
+    """Polls the scroll state for up to `settle_time` and returns it as soon as it changes."""
+    deadline = time.monotonic() + settle_time
+    while True:
+        current = scroll_state(driver, table_div)
+        if current[:2] != state[:2] or time.monotonic() >= deadline:
+            return current
+        time.sleep(waits.POLL_INTERVAL)
+
+
+def scroll_until_converged(driver, table_div, settle_time=SETTLE_TIME, max_settle_time=MAX_SETTLE_TIME,
+                           stable_checks=STABLE_CHECKS, max_steps=MAX_SCROLL_STEPS, on_step=None):
+    """
+    Scrolls the table with PAGE_DOWN until the rendered row count and the scroll
+    position stop changing.
+
+    While new rows keep arriving every step uses the short `settle_time`. When a
+    step changes nothing before the bottom is reached (slow render), the settle
+    time doubles up to `max_settle_time` before giving up.
+
+    Parameters:
+    driver : WebDriver instance
+    table_div : WebElement : The scrollable table element
+    settle_time : float : Seconds to watch for changes after each step
+    max_settle_time : float : Upper bound for the back-off
+    stable_checks : int : Unchanged steps at the bottom needed to stop
+    max_steps : int : Hard cap on PAGE_DOWN presses
+    on_step : callable : Optional callback, called as on_step(step) after each step
+
+    Returns:
+    Number of scroll steps the page needed
+    """
+    state = scroll_state(driver, table_div)
+    settle = settle_time
+    stable = 0
+    steps = 0
+
+    while steps < max_steps:
+        table_div.send_keys(Keys.PAGE_DOWN)
+        steps += 1
+        new_state = _wait_for_change(driver, table_div, state, settle)
+        if on_step:
+            on_step(steps)
+
+        if new_state[:2] != state[:2]:
+            # Still moving or rows still arriving: keep the fast pace
+            state, settle, stable = new_state, settle_time, 0
+            continue
+
+        state = new_state
+        if state[2]:
+            stable += 1
+            if stable >= stable_checks:
+                break
+        elif settle < max_settle_time:
+            settle = min(settle * 2, max_settle_time)
+        else:
+            logging.warning(f"⚠️ Table stopped scrolling before the bottom after {steps} steps")
+            break
+    else:
+        logging.warning(f"⚠️ Reached the scroll safety cap of {max_steps} steps")
+
+    return steps
+
+
+def scroll_fixed(table_div, max_scroll_attempts=15, wait_time=1, on_step=None):
+    """The original pacing: a fixed number of PAGE_DOWN presses with a fixed pause."""
+    for step in range(1, max_scroll_attempts + 1):
+        table_div.send_keys(Keys.PAGE_DOWN)  # Scroll inside the div
+        time.sleep(wait_time)
+        if on_step:
+            on_step(step)
+    time.sleep(2)
+    return max_scroll_attempts
@@ -0,0 +1,171 @@
+import os
+import json
+import time
+import logging
+import tempfile
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support import expected_conditions as EC
+
+from .waits import wait_for, clickable, present
+from .timing import timed
+
+
+SESSION_FILE = "google_session.json"
+SESSION_MAX_AGE = 7 * 24 * 3600  # seconds before a saved session is not even tried
+ADS_ORIGIN = "https://ads.google.com"
+ADS_HOME_URL = "https://ads.google.com/aw/campaigns"
+PASSWORD_ENV_VAR = "GOOGLE_ADS_PASSWORD"  # password of the --email account, kept out of argv and pickles
+
+# Fields of a CDP cookie that Network.setCookies accepts back
+_COOKIE_FIELDS = ("name", "value", "domain", "path", "secure", "httpOnly", "sameSite", "expires")
+
+_READ_STORAGE_JS = """
+var items = {};
+for (var i = 0; i < window.localStorage.length; i++) {
+    var key = window.localStorage.key(i);
+    items[key] = window.localStorage.getItem(key);
+}
+return items;
+"""
+
+_WRITE_STORAGE_JS = """
+var items = arguments[0];
+for (var key in items) { window.localStorage.setItem(key, items[key]); }
+"""
+
+
+@timed("login")
+def google_login(driver, email, password):
+    """Signs in through the Google account form and waits for the account page."""
+    logging.info("Opening Google Sign-In Page...")
+    driver.get("https://accounts.google.com/signin")
+
+    # Enter Email
+    present(driver, '//input[@name="identifier"]', step="login").send_keys(email)
+    logging.info("Entered Email.")
+
+    clickable(driver, '//*[@id="identifierNext"]/div/button', step="login").click()
+    logging.info("Clicked Next after Email.")
+
+    # Enter Password
+    password_field = present(driver, '//input[@name="Passwd"]', step="login")
+    logging.info("Password field is visible.")
+
+    password_field.send_keys(password)
+    logging.info("Entered Password.")
+
+    clickable(driver, '//*[@id="passwordNext"]/div/button', step="login").click()
+    logging.info("Clicked Next after Password.")
+
+    # Wait for potential 2FA or redirects to land on the account page
+    wait_for(driver, EC.url_contains("myaccount.google.com"), step="login")
+    logging.info("Login Successful!")
+
+
+@timed("session_save")
+def save_session(driver, path=SESSION_FILE):
+    """
+    Saves all cookies of the browser (every Google domain, via CDP) and the
+    localStorage of the Ads origin, so later sessions can skip the login.
+    """
+    if not driver.current_url.startswith(ADS_ORIGIN):
+        driver.get(ADS_HOME_URL)
+    cookies = driver.execute_cdp_cmd("Network.getAllCookies", {})["cookies"]
+    session = {
+        "saved_at": time.time(),
+        "cookies": [{k: c[k] for k in _COOKIE_FIELDS if k in c and not (k == "expires" and c.get("session"))}
+                    for c in cookies],
+        "local_storage": driver.execute_script(_READ_STORAGE_JS),
+    }
+
+    # Write atomically so parallel workers never read a half-written file. The
+    # temp file is unique per call: thread workers share a pid but may all save.
+    # mkstemp creates it readable by the owner only (0600).
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(session, f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    logging.info(f"💾 Saved session with {len(session['cookies'])} cookies to {path}")
+
+
+@timed("session_restore")
+def restore_session(driver, path=SESSION_FILE, max_age=SESSION_MAX_AGE):
+    """
+    Loads a saved session into the browser. Returns False if there is no
+    usable session file; it does not check whether Google still accepts it.
+    """
+    if not os.path.exists(path):
+        return False
+    try:
+        with open(path, encoding="utf-8") as f:
+            session = json.load(f)
+    except (OSError, ValueError) as e:
+        logging.warning(f"⚠️ Could not read session file {path}: {e}")
+        return False
+    if time.time() - session.get("saved_at", 0) > max_age:
+        logging.info("Saved session is too old, ignoring it.")
+        return False
+
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setCookies", {"cookies": session["cookies"]})
+
+    if session.get("local_storage"):
+        # localStorage can only be written from a page of its origin
+        driver.get(ADS_ORIGIN + "/robots.txt")
+        driver.execute_script(_WRITE_STORAGE_JS, session["local_storage"])
+    logging.info(f"Restored session from {path}")
+    return True
+
+
+@timed("session_check")
+def session_is_valid(driver):
+    """
+    Cheap check: opens the Ads UI and sees whether it stays there or bounces
+    to the Google sign-in page.
+    """
+    driver.get(ADS_HOME_URL)
+    try:
+        wait_for(driver, lambda d: "accounts.google.com" in d.current_url or "/aw/" in d.current_url,
+                 step="navigation")
+    except TimeoutException:
+        return False
+    return "/aw/" in driver.current_url and "accounts.google.com" not in driver.current_url
+
+
+def is_signed_out(driver):
+    """True if the browser was sent to the Google sign-in page, e.g. because the session expired."""
+    return "accounts.google.com" in driver.current_url
+
+
+def start_session(driver, email="", password=None, session_file=SESSION_FILE):
+    """
+    Restores the saved session if Google still accepts it, otherwise logs in
+    and saves the new session. Leaves the browser on the Google Ads UI.
+
+    Parameters:
+    driver : WebDriver instance
+    email : str : Google account email, only used when a login is needed
+    password : str : Google account password, only used when a login is needed;
+                     None reads it from $GOOGLE_ADS_PASSWORD
+    session_file : str : Path of the session cache, None to always log in
+    """
+    if session_file and restore_session(driver, session_file):
+        if session_is_valid(driver):
+            logging.info("✅ Reused saved session, skipping login.")
+            return
+        logging.info("Saved session is stale, logging in again.")
+        driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+
+    if password is None:
+        password = os.environ.get(PASSWORD_ENV_VAR, "")
+    if not email or not password:
+        logging.warning(f"⚠️ No saved session and no credentials (--email and ${PASSWORD_ENV_VAR}): "
+                        f"finish the sign-in in the browser window")
+    google_login(driver, email, password)
+    driver.get(ADS_HOME_URL)
+    if session_file:
+        save_session(driver, session_file)
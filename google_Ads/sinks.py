@@ -0,0 +1,132 @@
+import os
+import glob
+import uuid
+import logging
+from datetime import datetime
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+
+DATASET_DIR = "asset_stats"
+OUTPUT_FORMATS = ("csv", "parquet")
+COMPRESSION = "zstd"
+BATCH_ROWS = 5000  # rows per batch when a journal or cached CSV is streamed back
+
+# Typed schema of the asset table in the Parquet dataset
+SCHEMA = pa.schema([
+    ("Asset", pa.dictionary(pa.int32(), pa.string())),
+    ("Clicks", pa.int32()),
+    ("Impr.", pa.int32()),
+    ("CTR", pa.float32()),
+    ("Avg. CPC", pa.float32()),
+    ("Cost", pa.float32()),
+    ("window_start", pa.date32()),
+    ("window_end", pa.date32()),
+])
+
+
+# Arrow types of typed columns outside SCHEMA (pandas dtype -> Arrow type); anything else is stored as text
+_EXTRA_TYPES = {"Int32": pa.int32(), "Float32": pa.float32()}
+
+
+def partition_dir(dataset_dir, date_chunk, account_id=None, asset_type=None):
+    """dataset_dir/window=2025-01-06_2025-01-12/account=<id>[/asset_type=<slug>]"""
+    start, end = (datetime.strptime(d, "%m/%d/%Y").date() for d in date_chunk)
+    path = os.path.join(dataset_dir, f"window={start.isoformat()}_{end.isoformat()}",
+                        f"account={account_id or 'default'}")
+    return os.path.join(path, f"asset_type={asset_type}") if asset_type else path
+
+
+def table_schema(df):
+    """SCHEMA plus the columns of `df` it does not know, e.g. the extra metrics of an asset type."""
+    extra = [pa.field(column, _EXTRA_TYPES.get(str(df[column].dtype), pa.string()))
+             for column in df.columns if column not in SCHEMA.names]
+    return pa.schema(list(SCHEMA) + extra)
+
+
+def _to_table(df, date_chunk, schema=SCHEMA):
+    """Adds the window columns and converts a typed frame to a `schema` table."""
+    typed = df.copy()
+    start, end = (datetime.strptime(d, "%m/%d/%Y").date() for d in date_chunk)
+    typed["window_start"] = start
+    typed["window_end"] = end
+    for field in schema:
+        if field.name not in typed.columns:
+            typed[field.name] = None
+    return pa.Table.from_pandas(typed[schema.names], schema=schema, preserve_index=False)
+
+
+class ParquetChunkWriter:
+    """
+    Incremental writer for one chunk of the partitioned Parquet dataset.
+
+    Every write() appends a row group to a temporary part file, so only the
+    current page is held in memory. commit() renames the part into its
+    partition and removes older parts of the same partition; abort() drops
+    the temporary file. Readers therefore see either the previous or the new
+    chunk, never a mix or a half-written file.
+
+    The file schema is SCHEMA widened by the extra columns of the first page
+    (see table_schema), so each asset type keeps its own columns.
+    """
+
+    def __init__(self, dataset_dir, date_chunk, account_id=None, asset_type=None):
+        self.date_chunk = date_chunk
+        self.target_dir = partition_dir(dataset_dir, date_chunk, account_id, asset_type)
+        os.makedirs(self.target_dir, exist_ok=True)
+        self.part_path = os.path.join(self.target_dir, f"part-{uuid.uuid4().hex}.parquet")
+        self.tmp_path = os.path.join(self.target_dir, f".{os.path.basename(self.part_path)}.tmp")
+        self.writer = None
+        self.schema = None
+        self.rows = 0
+
+    def write(self, df):
+        """Appends a page, already typed by normalize.normalize_metrics, as one row group."""
+        if len(df):
+            if self.writer is None:
+                self.schema = table_schema(df)
+                self.writer = pq.ParquetWriter(self.tmp_path, self.schema, compression=COMPRESSION)
+            self.writer.write_table(_to_table(df, self.date_chunk, self.schema))
+            self.rows += len(df)
+
+    def commit(self):
+        """Publishes the part file. Returns its path."""
+        if self.writer is None:
+            raise ValueError("Nothing was written, there is no part file to commit")
+        previous_parts = glob.glob(os.path.join(self.target_dir, "part-*.parquet"))
+        self.writer.close()
+        os.replace(self.tmp_path, self.part_path)
+        for path in previous_parts:
+            os.remove(path)
+        logging.info(f"✅ Committed {self.rows} rows to {self.part_path}")
+        return self.part_path
+
+    def abort(self):
+        """Discards the part file if it was not committed."""
+        if self.writer is not None and os.path.exists(self.tmp_path):
+            self.writer.close()
+            os.remove(self.tmp_path)
+
+
+def write_parquet_chunk(dataset_dir, df, date_chunk, account_id=None, asset_type=None):
+    """
+    Commits one chunk, already typed by normalize.normalize_metrics, to the
+    partitioned Parquet dataset in a single write.
+
+    Returns:
+    Path of the committed part file
+    """
+    writer = ParquetChunkWriter(dataset_dir, date_chunk, account_id, asset_type)
+    try:
+        writer.write(df)
+        return writer.commit()
+    finally:
+        writer.abort()
+
+
+def read_csv_batches(csv_path, batch_rows=BATCH_ROWS):
+    """Reads a scraped CSV back as string DataFrames of at most `batch_rows` rows."""
+    with pd.read_csv(csv_path, dtype=str, keep_default_na=False, chunksize=batch_rows) as reader:
+        for batch in reader:
+            yield batch
@@ -0,0 +1,228 @@
+import os
+import math
+import glob
+import json
+import time
+import logging
+import functools
+import threading
+import contextlib
+import contextvars
+
+
+TIMING_DIR = "timings"
+SUMMARY_FILE = "summary.json"
+PROMETHEUS_FILE = "google_ads.prom"
+QUANTILES = (0.5, 0.95)
+METRIC_PREFIX = "google_ads"
+
+# Exported so that pool worker processes (spawned, not forked) find the directory
+_ENV_VAR = "GOOGLE_ADS_TIMING_DIR"
+
+# Labels (chunk, page, ...) of the enclosing spans, per thread
+_labels = contextvars.ContextVar("timing_labels", default={})
+_spans = []
+_lock = threading.Lock()
+
+
+def enable(timing_dir=TIMING_DIR, reset=True):
+    """
+    Streams every finished span to timing_dir/spans-<pid>.jsonl, so spans of
+    worker processes and of crashed runs end up in the report too.
+
+    Parameters:
+    timing_dir : str : Directory of the span files and the reports
+    reset : bool : Remove span files of earlier runs
+    """
+    os.makedirs(timing_dir, exist_ok=True)
+    if reset:
+        for path in glob.glob(os.path.join(timing_dir, "spans-*.jsonl")):
+            os.remove(path)
+    os.environ[_ENV_VAR] = timing_dir
+
+
+def _record(step, seconds, started_at, labels, error):
+    entry = {"step": step, "seconds": round(seconds, 6), "start": round(started_at, 3), "labels": labels}
+    if error:
+        entry["error"] = error
+    _append(entry)
+
+
+def _append(entry):
+    timing_dir = os.environ.get(_ENV_VAR)
+    with _lock:
+        _spans.append(entry)
+        if timing_dir:
+            with open(os.path.join(timing_dir, f"spans-{os.getpid()}.jsonl"), "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+
+
+@contextlib.contextmanager
+def span(step, **labels):
+    """
+    Times the enclosed block as `step`. The labels (e.g. chunk, page) also
+    apply to every span opened inside the block.
+
+        with span("chunk", chunk="01-06-2025_01-12-2025"):
+            with span("scroll"):
+                ...
+    """
+    merged = {**_labels.get(), **{key: str(value) for key, value in labels.items()}}
+    token = _labels.set(merged)
+    started_at = time.time()
+    started = time.perf_counter()
+    error = None
+    try:
+        yield
+    except BaseException as e:
+        error = type(e).__name__
+        raise
+    finally:
+        _labels.reset(token)
+        _record(step, time.perf_counter() - started, started_at, merged, error)
+
+
+def timed(step):
+    """Decorator form of span() for functions that are one step as a whole."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(step):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def count(name, value=1):
+    """
+    Adds `value` to the run counter `name` (e.g. pages_saved). Counters are
+    summed over all processes and reported next to the step timings.
+    """
+    _append({"counter": name, "value": value, "labels": dict(_labels.get())})
+
+
+def load_spans(timing_dir=None):
+    """Spans and counter entries of all processes from `timing_dir`, or of this process if None."""
+    if not timing_dir:
+        with _lock:
+            return list(_spans)
+    spans = []
+    for path in sorted(glob.glob(os.path.join(timing_dir, "spans-*.jsonl"))):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    try:
+                        spans.append(json.loads(line))
+                    except ValueError:
+                        pass  # last line of a killed process
+    return spans
+
+
+def _quantile(sorted_values, q):
+    """Nearest-rank quantile of an already sorted list."""
+    return sorted_values[max(0, math.ceil(q * len(sorted_values)) - 1)]
+
+
+def summarize(spans):
+    """
+    Aggregates spans per step (count, total, mean, p50, p95, max, errors) and
+    the time per step of every chunk, and sums the counters. Spans nest (a
+    page contains its scroll and parse), so totals of different steps overlap.
+    """
+    by_step = {}
+    by_chunk = {}
+    counters = {}
+    for entry in spans:
+        if "counter" in entry:
+            counters[entry["counter"]] = counters.get(entry["counter"], 0) + entry["value"]
+    spans = [entry for entry in spans if "counter" not in entry]
+    for entry in spans:
+        by_step.setdefault(entry["step"], []).append(entry)
+        chunk = entry["labels"].get("chunk")
+        if chunk:
+            steps = by_chunk.setdefault(chunk, {})
+            steps[entry["step"]] = round(steps.get(entry["step"], 0) + entry["seconds"], 6)
+
+    steps = {}
+    for step, entries in sorted(by_step.items()):
+        durations = sorted(entry["seconds"] for entry in entries)
+        total = sum(durations)
+        steps[step] = {
+            "count": len(durations),
+            "total_seconds": round(total, 6),
+            "mean_seconds": round(total / len(durations), 6),
+            **{f"p{int(q * 100)}_seconds": _quantile(durations, q) for q in QUANTILES},
+            "max_seconds": durations[-1],
+            "errors": sum(1 for entry in entries if entry.get("error")),
+        }
+
+    starts = [entry["start"] for entry in spans]
+    ends = [entry["start"] + entry["seconds"] for entry in spans]
+    return {
+        "generated_at": time.time(),
+        "wall_seconds": round(max(ends) - min(starts), 3) if spans else 0,
+        "steps": steps,
+        "chunks": by_chunk,
+        "counters": dict(sorted(counters.items())),
+    }
+
+
+def _prometheus_text(summary):
+    name = f"{METRIC_PREFIX}_step_seconds"
+    lines = [
+        f"# HELP {name} Duration of scraper steps.",
+        f"# TYPE {name} summary",
+    ]
+    for step, stats in summary["steps"].items():
+        for q in QUANTILES:
+            lines.append(f'{name}{{step="{step}",quantile="{q}"}} {stats[f"p{int(q * 100)}_seconds"]}')
+        lines.append(f'{name}_sum{{step="{step}"}} {stats["total_seconds"]}')
+        lines.append(f'{name}_count{{step="{step}"}} {stats["count"]}')
+
+    errors = f"{METRIC_PREFIX}_step_errors_total"
+    lines += [f"# HELP {errors} Steps that ended with an exception.", f"# TYPE {errors} counter"]
+    lines += [f'{errors}{{step="{step}"}} {stats["errors"]}' for step, stats in summary["steps"].items()]
+
+    for counter, value in summary["counters"].items():
+        total = f"{METRIC_PREFIX}_{counter}_total"
+        lines += [f"# TYPE {total} counter", f"{total} {value}"]
+
+    wall = f"{METRIC_PREFIX}_run_wall_seconds"
+    lines += [f"# HELP {wall} Wall time covered by the recorded spans.", f"# TYPE {wall} gauge",
+              f"{wall} {summary['wall_seconds']}"]
+    return "\n".join(lines) + "\n"
+
+
+def _write_atomic(path, text):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+def write_report(timing_dir=None, summary_path=None, prometheus_path=None):
+    """
+    Writes the run summary as JSON and in the Prometheus text format (for the
+    node_exporter textfile collector) and logs the slowest steps.
+
+    Parameters:
+    timing_dir : str : Directory with the span files, None for this process' spans only
+    summary_path : str : JSON summary, defaults to timing_dir/summary.json
+    prometheus_path : str : Prometheus file, defaults to timing_dir/google_ads.prom
+
+    Returns:
+    The summary dict
+    """
+    timing_dir = timing_dir or os.environ.get(_ENV_VAR)
+    out_dir = timing_dir or "."
+    summary = summarize(load_spans(timing_dir))
+    _write_atomic(summary_path or os.path.join(out_dir, SUMMARY_FILE), json.dumps(summary, indent=2))
+    _write_atomic(prometheus_path or os.path.join(out_dir, PROMETHEUS_FILE), _prometheus_text(summary))
+
+    slowest = sorted(summary["steps"].items(), key=lambda item: item[1]["total_seconds"], reverse=True)
+    for step, stats in slowest[:8]:
+        logging.info(f"⏱️ {step}: {stats['total_seconds']:.2f}s total over {stats['count']} "
+                     f"(p50 {stats['p50_seconds']:.3f}s, p95 {stats['p95_seconds']:.3f}s)")
+    for counter, value in summary["counters"].items():
+        logging.info(f"🔢 {counter}: {value}")
+    return summary
@@ -0,0 +1,207 @@
+import time
+import logging
+from datetime import datetime
+from selenium.common.exceptions import StaleElementReferenceException, TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.common.keys import Keys
+
+
+# How often every wait re-checks its condition (seconds)
+POLL_INTERVAL = 0.1
+
+# Timeout per UI step (seconds). Each wait names the step it belongs to.
+STEP_TIMEOUTS = {
+    "default": 10,
+    "calendar": 5,
+    "date_input": 5,
+    "apply": 5,
+    "table_render": 15,
+    "pagination": 10,
+    "navigation": 10,
+    "login": 60,
+    "filter": 10,
+}
+
+CALENDAR_XPATH = "//div[@aria-label[contains(., 'Not applicable')]]"
+START_DATE_XPATH = "//label[.//span[text()='Start date']]/input"
+END_DATE_XPATH = "//label[.//span[text()='End date']]/input"
+TABLE_CANVAS_CLASS = "ess-table-canvas"
+PAGINATION_LABEL_XPATH = "//pagination-bar//*[contains(text(), ' of ')]"
+
+# Formats the calendar inputs may echo a typed date back in
+_DATE_FORMATS = ("%m/%d/%Y", "%m/%d/%y", "%b %d, %Y", "%B %d, %Y", "%Y-%m-%d")
+
+
+def configure_waits(poll_interval=None, **step_timeouts):
+    """
+    Overrides the poll interval and/or the timeout of individual steps.
+
+    Parameters:
+    poll_interval : float : Seconds between condition checks
+    step_timeouts : float : Step name -> timeout in seconds (e.g. calendar=3)
+    """
+    global POLL_INTERVAL
+    if poll_interval is not None:
+        POLL_INTERVAL = poll_interval
+    STEP_TIMEOUTS.update(step_timeouts)
+
+
+def wait_for(driver, condition, step="default", timeout=None, poll=None):
+    """
+    Waits until `condition(driver)` returns a truthy value and returns it.
+
+    Parameters:
+    driver : WebDriver instance
+    condition : callable : Selenium-style condition taking the driver
+    step : str : Name of the step, used to look up its timeout
+    timeout : float : Overrides the step timeout
+    poll : float : Overrides the global poll interval
+
+    Raises TimeoutException if the condition is not met in time.
+    """
+    if timeout is None:
+        timeout = STEP_TIMEOUTS.get(step, STEP_TIMEOUTS["default"])
+    if poll is None:
+        poll = POLL_INTERVAL
+    wait = WebDriverWait(driver, timeout, poll_frequency=poll,
+                         ignored_exceptions=(StaleElementReferenceException,))
+    return wait.until(condition, message=f"Timed out waiting for step '{step}' after {timeout}s")
+
+
+def try_wait_for(driver, condition, step="default", timeout=None, poll=None):
+    """
+    Same as `wait_for`, but returns False instead of raising on timeout.
+    Used for signals that legitimately may not happen (e.g. identical data).
+    """
+    try:
+        return wait_for(driver, condition, step=step, timeout=timeout, poll=poll)
+    except TimeoutException:
+        logging.debug(f"Wait for step '{step}' timed out, continuing.")
+        return False
+
+
+def clickable(driver, xpath, step="default", timeout=None):
+    """Waits for the element at `xpath` to be clickable and returns it."""
+    return wait_for(driver, EC.element_to_be_clickable((By.XPATH, xpath)), step=step, timeout=timeout)
+
+
+def present(driver, xpath, step="default", timeout=None):
+    """Waits for the element at `xpath` to be present and returns it."""
+    return wait_for(driver, EC.presence_of_element_located((By.XPATH, xpath)), step=step, timeout=timeout)
+
+
+# ---------------------------------------------------------------------------
+# Conditions for the concrete UI signals the scrapers depend on
+# ---------------------------------------------------------------------------
+
+def calendar_open(driver):
+    """True once the calendar popup shows its Start/End date inputs."""
+    inputs = driver.find_elements(By.XPATH, START_DATE_XPATH)
+    return inputs[0] if inputs and inputs[0].is_displayed() else False
+
+
+def _parse_date(text):
+    text = (text or "").strip()
+    for fmt in _DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+def input_value_accepted(xpath, expected):
+    """
+    Condition: the input at `xpath` holds `expected`, either verbatim or
+    re-formatted by the widget into an equal date.
+    """
+    expected_date = _parse_date(expected)
+
+    def _condition(driver):
+        elements = driver.find_elements(By.XPATH, xpath)
+        if not elements:
+            return False
+        value = elements[0].get_attribute("value") or ""
+        if value.strip() == expected.strip():
+            return True
+        return expected_date is not None and _parse_date(value) == expected_date
+
+    return _condition
+
+
+def element_removed(xpath):
+    """Condition: no element matches `xpath` any more (e.g. a popup closed)."""
+    def _condition(driver):
+        return not any(el.is_displayed() for el in driver.find_elements(By.XPATH, xpath))
+    return _condition
+
+
+_TABLE_SIGNATURE_JS = """
+var canvas = document.getElementsByClassName(arguments[0])[0];
+if (!canvas) { return null; }
+var rows = canvas.querySelectorAll("div[role='row']");
+var parts = [rows.length];
+for (var i = 0; i < rows.length && i < 3; i++) { parts.push(rows[i].textContent); }
+return parts.join("|");
+"""
+
+
+def table_signature(driver):
+    """
+    Returns a cheap fingerprint of the rendered `ess-table-canvas` (row count
+    plus the text of its first rows), or None if the table is not rendered.
+    """
+    return driver.execute_script(_TABLE_SIGNATURE_JS, TABLE_CANVAS_CLASS)
+
+
+def table_rerendered(previous_signature):
+    """Condition: the table is rendered and differs from `previous_signature`."""
+    def _condition(driver):
+        signature = table_signature(driver)
+        return signature is not None and signature != previous_signature
+    return _condition
+
+
+def pagination_label(driver):
+    """Returns the pagination label text (e.g. '1 - 50 of 321') or None."""
+    labels = driver.find_elements(By.XPATH, PAGINATION_LABEL_XPATH)
+    return labels[0].text.strip() if labels else None
+
+
+def pagination_label_changed(previous_label):
+    """Condition: the pagination label is shown and differs from `previous_label`."""
+    def _condition(driver):
+        label = pagination_label(driver)
+        return bool(label) and label != previous_label
+    return _condition
+
+
+def wait_for_table_refresh(driver, previous_signature, step="table_render", timeout=None):
+    """
+    Waits for the table to re-render after an action that changes its content
+    (date range, filter, page change). Returns False if the table is rendered but
+    unchanged when the timeout hits, which happens when the new data is identical.
+    """
+    started = time.monotonic()
+    changed = try_wait_for(driver, table_rerendered(previous_signature), step=step, timeout=timeout)
+    if not changed:
+        # Make sure the table is at least there before moving on
+        wait_for(driver, EC.presence_of_element_located((By.CLASS_NAME, TABLE_CANVAS_CLASS)), step=step)
+    logging.debug(f"Table refresh took {time.monotonic() - started:.2f}s (changed={bool(changed)})")
+    return bool(changed)
+
+
+def fill_date_input(driver, xpath, value, step="date_input"):
+    """
+    Types `value` into the date input at `xpath`, confirms it with RETURN and
+    waits until the widget has accepted the value.
+    """
+    date_input = clickable(driver, xpath, step=step)
+    date_input.click()
+    date_input.clear()
+    date_input.send_keys(value)
+    date_input.send_keys(Keys.RETURN)
+    wait_for(driver, input_value_accepted(xpath, value), step=step)
+    return date_input
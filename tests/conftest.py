@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Make the google_Ads package importable without installing it
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
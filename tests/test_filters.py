@@ -0,0 +1,29 @@
+"""Filter chips must match a filter exactly, not by substring."""
+import pytest
+
+from google_Ads.filters import _chip_matches
+
+FILTER = ("Campaign name", "contains", "omni")
+
+
+@pytest.mark.parametrize("chip", [
+    "Campaign name contains omni",
+    "Campaign name contains: omni",
+    "Campaign  name Contains: \"Omni\"",
+])
+def test_chip_shows_filter(chip):
+    assert _chip_matches(chip, FILTER)
+
+
+@pytest.mark.parametrize("chip", [
+    "Campaign name does not contain omni",
+    "Campaign name contains omnibus",
+    "Campaign name contains: omni, mohey",
+])
+def test_chip_shows_other_filter(chip):
+    assert not _chip_matches(chip, FILTER)
+
+
+def test_negated_operator():
+    assert not _chip_matches("Status is not Enabled", ("Status", "is", "Enabled"))
+    assert _chip_matches("Status is Enabled", ("Status", "is", "Enabled"))
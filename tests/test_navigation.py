@@ -0,0 +1,29 @@
+"""Remembered deep links written by several thread workers at once."""
+import json
+import threading
+
+from google_Ads.navigation import remember_assets_url, load_assets_url
+
+
+def test_concurrent_remember_keeps_every_account(tmp_path):
+    path = str(tmp_path / "assets_url.json")
+    errors = []
+
+    def worker(i):
+        try:
+            for j in range(20):
+                remember_assets_url(f"https://ads.example/{i}/{j}", path, account_id=f"{i}-{j}")
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    with open(path, encoding="utf-8") as f:
+        assert len(json.load(f)) == 8 * 20
+    assert load_assets_url(path, "3-7") == "https://ads.example/3/7"
+    assert [p.name for p in tmp_path.iterdir()] == ["assets_url.json"]  # no temp files left
@@ -0,0 +1,35 @@
+"""Every installed parser backend must return exactly the rows of the reference loop."""
+import os
+import glob
+import json
+
+import pytest
+
+from google_Ads.parsing import PARSERS, parse_rows, parse_rows_reference, main
+
+FIXTURES = sorted(glob.glob(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                         "google_Ads", "fixtures", "*.html")))
+
+
+def _read(path):
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+
+def test_fixtures_present():
+    assert FIXTURES, "no fixtures found in google_Ads/fixtures"
+
+
+@pytest.mark.parametrize("parser", sorted(PARSERS))
+@pytest.mark.parametrize("path", FIXTURES, ids=os.path.basename)
+def test_backend_matches_reference(path, parser):
+    html = _read(path)
+    expected = parse_rows_reference(html)
+    actual = parse_rows(html, parser)
+    assert actual == expected
+    # The CLI check compares the serialized rows byte for byte
+    assert json.dumps(actual, ensure_ascii=False) == json.dumps(expected, ensure_ascii=False)
+
+
+def test_parity_command():
+    assert main(FIXTURES) == 0
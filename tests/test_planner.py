@@ -0,0 +1,37 @@
+"""Adaptive chunking: windows and row budget."""
+from google_Ads.planner import (
+    INITIAL_PAGE_SIZE, break_into_weekly_chunks, plan_adaptive_windows, adaptive_estimate,
+)
+
+
+def _unknown(date_chunk):
+    return None
+
+
+def test_no_history_is_the_weekly_plan():
+    # The range crosses two month boundaries in the middle of a week
+    windows = plan_adaptive_windows("1/20/2025", "3/9/2025", _unknown, 500)
+    assert [window for window, _ in windows] == break_into_weekly_chunks("1/20/2025", "3/9/2025")
+
+
+def test_known_months_stay_whole():
+    windows = plan_adaptive_windows("1/1/2025", "3/31/2025", lambda date_chunk: 10, 500)
+    assert [window for window, _ in windows] == [("01/01/2025", "01/31/2025"), ("02/01/2025", "02/28/2025"),
+                                                 ("03/01/2025", "03/31/2025")]
+
+
+def test_week_reaching_into_a_known_month():
+    def estimate(date_chunk):
+        return None if date_chunk[0].startswith("01/") else 10
+
+    windows = [window for window, _ in plan_adaptive_windows("1/20/2025", "2/28/2025", estimate, 500)]
+    assert windows == [("01/20/2025", "01/26/2025"), ("01/27/2025", "02/02/2025"), ("02/03/2025", "02/28/2025")]
+
+
+def test_row_budget_uses_the_probed_page_size(tmp_path):
+    _, row_budget = adaptive_estimate([str(tmp_path)], page_budget=10)
+    assert row_budget == 10 * INITIAL_PAGE_SIZE
+    estimate, row_budget = adaptive_estimate([str(tmp_path)], page_budget=10,
+                                             probe=lambda date_chunk: (1234, 500), page_size=500)
+    assert row_budget == 5000
+    assert estimate(("01/01/2025", "01/31/2025")) == 1234
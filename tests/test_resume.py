@@ -0,0 +1,77 @@
+"""Resuming a chunk from its manifest record."""
+import pytest
+
+from google_Ads import scraper
+from google_Ads.manifest import IN_PROGRESS, DONE, INCOMPLETE, new_record, save_chunk, load_chunk, mark_page
+
+DATE_CHUNK = ("01/06/2025", "01/12/2025")
+
+
+@pytest.fixture
+def offline_table(monkeypatch):
+    """The table of a two page chunk, without a browser: paging fails the test."""
+    def no_paging(*args, **kwargs):
+        raise AssertionError("paged although every page was written")
+
+    monkeypatch.setattr(scraper, "select_date_range", lambda driver, start, end: None)
+    monkeypatch.setattr(scraper, "table_layout", lambda driver: (3, 2, 2))
+    monkeypatch.setattr(scraper, "extract_google_ads_data", no_paging)
+    monkeypatch.setattr(scraper, "skip_pages", no_paging)
+    monkeypatch.setattr(scraper, "next_page", no_paging)
+    monkeypatch.setattr(scraper, "first_page", no_paging)
+
+
+def test_all_pages_written_before_interrupt(tmp_path, offline_table):
+    manifest_dir = str(tmp_path / "manifest")
+    csv_path = tmp_path / "chunk.csv"
+    csv_path.write_text("Asset,Clicks\na,1\nb,2\nc,3\n", encoding="utf-8")
+    record = new_record(DATE_CHUNK, str(csv_path))
+    record["status"] = IN_PROGRESS
+    save_chunk(manifest_dir, record)
+    mark_page(manifest_dir, record, 1, 2)
+    mark_page(manifest_dir, record, 2, 1)  # killed here, before the chunk was marked done
+
+    output = scraper.scrape_chunk(None, DATE_CHUNK, manifest_dir=manifest_dir)
+
+    assert output == str(csv_path)
+    record = load_chunk(manifest_dir, DATE_CHUNK)
+    assert record["status"] == DONE
+    assert record["rows"] == 3
+    assert csv_path.read_text(encoding="utf-8").count("\n") == 4
+
+
+def test_iter_pages_past_the_last_page():
+    assert list(scraper.iter_pages(None, "//table", "//next", max_pages=2, start_page=3)) == []
+
+
+def _page_source(rows_per_page):
+    import pandas as pd
+
+    pages = iter(rows_per_page)
+
+    def extract(driver, table_xpath, **kwargs):
+        return pd.DataFrame({"Asset": [f"asset {kwargs['page_num']}-{i}" for i in range(next(pages))]})
+    return extract
+
+
+def test_short_chunk_is_scraped_again(tmp_path, monkeypatch):
+    manifest_dir = str(tmp_path / "manifest")
+    csv_path = tmp_path / "chunk.csv"
+    save_chunk(manifest_dir, new_record(DATE_CHUNK, str(csv_path)))
+    monkeypatch.setattr(scraper, "select_date_range", lambda driver, start, end: None)
+    monkeypatch.setattr(scraper, "table_layout", lambda driver: (3, 2, 2))
+    monkeypatch.setattr(scraper, "next_page", lambda driver, xpath: None)
+    monkeypatch.setattr(scraper, "first_page", lambda driver, xpath: None)
+
+    # A row went missing: the chunk must not count as done
+    monkeypatch.setattr(scraper, "extract_google_ads_data", _page_source([2, 0]))
+    scraper.scrape_chunk(None, DATE_CHUNK, manifest_dir=manifest_dir)
+    assert load_chunk(manifest_dir, DATE_CHUNK)["status"] == INCOMPLETE
+
+    # The next attempt starts over at page 1 instead of resuming after page 2
+    monkeypatch.setattr(scraper, "extract_google_ads_data", _page_source([2, 1]))
+    scraper.scrape_chunk(None, DATE_CHUNK, manifest_dir=manifest_dir)
+    record = load_chunk(manifest_dir, DATE_CHUNK)
+    assert record["status"] == DONE
+    assert record["rows"] == 3
+    assert csv_path.read_text(encoding="utf-8").count("\n") == 4
@@ -0,0 +1,33 @@
+"""The table's "Total: ..." summary row must not end up among the asset rows."""
+import os
+import re
+
+import pytest
+
+from google_Ads.parsing import PARSERS, parse_rows, rows_to_dataframe, is_summary_row
+
+FIXTURE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                       "google_Ads", "fixtures", "ess_table_location.html")
+
+
+def _read(path):
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+
+@pytest.mark.parametrize("parser", sorted(PARSERS))
+def test_summary_row_dropped(parser):
+    html = _read(FIXTURE)
+    data_rows = len(re.findall(r'class="particle-table-row\b', html))
+    df = rows_to_dataframe(parse_rows(html, parser))
+    assert data_rows == 3
+    assert len(df) == data_rows
+    assert not df["Asset"].str.startswith("Total").any()
+
+
+def test_is_summary_row():
+    assert is_summary_row(["", "Total: Account", "1,291"])
+    assert is_summary_row(["", "Total: AccountFiltered Filtered", "1,291"])
+    assert not is_summary_row(["", "Total Wine & More", "12"])
+    assert not is_summary_row(["", "Omni Store – Downtown", "1,204"])
+    assert not is_summary_row(["Total: Account"])